@@ -0,0 +1,62 @@
+# bench/__init__.py
+"""
+Benchmarks sin ventana (SDL_VIDEODRIVER=dummy) de las rutas calientes del juego.
+
+    python -m bench run [-o resultados.json] [-n 200] [-k filtro]
+    python -m bench compare base.json nuevo.json [--umbral 10]
+    python -m bench carga [-k filtro] [--ticks 600] [--backend numpy]
+    python -m bench verificar [--partidas 200]
+"""
+import os
+import time
+
+# antes de importar pygame: sin ventana ni audio reales
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# las rutas de assets son relativas a la raíz del repo
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentil(ordenadas, p):
+    """Percentil p (0-100) de una lista ya ordenada, con interpolación lineal."""
+    if not ordenadas:
+        return 0.0
+    k = (len(ordenadas) - 1) * p / 100.0
+    i = int(k)
+    j = min(i + 1, len(ordenadas) - 1)
+    return ordenadas[i] + (ordenadas[j] - ordenadas[i]) * (k - i)
+
+
+def resumir(muestras_ms):
+    """mean/p50/p99/min/max (ms) de una lista de muestras."""
+    ordenadas = sorted(muestras_ms)
+    n = len(ordenadas)
+    return {
+        "n": n,
+        "mean_ms": sum(ordenadas) / n if n else 0.0,
+        "p50_ms": percentil(ordenadas, 50),
+        "p99_ms": percentil(ordenadas, 99),
+        "min_ms": ordenadas[0] if n else 0.0,
+        "max_ms": ordenadas[-1] if n else 0.0,
+    }
+
+
+def medir(fn, repeticiones=200, calentamiento=10, preparar=None):
+    """
+    Llama fn() `repeticiones` veces (más `calentamiento` descartadas) y devuelve el resumen.
+    preparar(), si se da, se llama antes de cada muestra y no se cuenta en el tiempo.
+    """
+    reloj = time.perf_counter
+    for _ in range(calentamiento):
+        if preparar:
+            preparar()
+        fn()
+    muestras = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        t0 = reloj()
+        fn()
+        muestras.append((reloj() - t0) * 1000.0)
+    return resumir(muestras)
@@ -0,0 +1,138 @@
+# bench/__main__.py
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from bench import RAIZ
+
+
+def _run(args):
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+    import pygame
+    from bench import micro
+    resultados = micro.ejecutar(args.k, args.n)
+    salida = {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "plataforma": platform.platform(),
+            "repeticiones": args.n,
+        },
+        "results": resultados,
+    }
+    if args.o:
+        with open(args.o, "w", encoding="utf-8") as f:
+            json.dump(salida, f, indent=2, sort_keys=True)
+        print(f"resultados guardados en {args.o}")
+    return 0
+
+
+def _carga(args):
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+    from bench import carga
+    resultados, fuera = carga.ejecutar(args.k, args.ticks, args.backend,
+                                       calidad_adaptativa=args.calidad is not None,
+                                       presupuesto_ms=args.calidad or None)
+    if args.o:
+        with open(args.o, "w", encoding="utf-8") as f:
+            json.dump({"meta": {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "ticks": args.ticks,
+                                "backend": args.backend, "plataforma": platform.platform()},
+                       "results": resultados}, f, indent=2, sort_keys=True)
+        print(f"resultados guardados en {args.o}")
+    print(f"{len(fuera)} escenario(s) fuera de presupuesto o vacíos" + (f": {', '.join(fuera)}" if fuera else ""))
+    return 1 if fuera else 0
+
+
+def _verificar(args):
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+    from bench import verificar
+    if args.calidad:
+        fallos = verificar.verificar_calidad()
+    elif args.baselines:
+        fallos = verificar.verificar_baselines()
+    elif args.lote:
+        fallos = verificar.verificar_lote(args.partidas, args.max_ticks, args.bot)
+    else:
+        fallos = verificar.verificar_backends(args.partidas, args.max_ticks)
+    return 1 if fallos else 0
+
+
+def comparar(base, nuevo, umbral_pct=10.0, metrica="p50_ms"):
+    """Devuelve [(nombre, valor_base, valor_nuevo, cambio_pct, es_regresion)] para los nombres comunes."""
+    filas = []
+    for nombre in sorted(set(base) & set(nuevo)):
+        a = base[nombre][metrica]
+        b = nuevo[nombre][metrica]
+        cambio = (b - a) / a * 100.0 if a > 0 else 0.0
+        filas.append((nombre, a, b, cambio, cambio > umbral_pct))
+    return filas
+
+
+def _compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)["results"]
+    with open(args.nuevo, encoding="utf-8") as f:
+        nuevo = json.load(f)["results"]
+    filas = comparar(base, nuevo, args.umbral, args.metrica)
+    regresiones = 0
+    for nombre, a, b, cambio, mala in filas:
+        marca = "REGRESIÓN" if mala else ""
+        regresiones += mala
+        print(f"{nombre:45s} {a:9.4f} -> {b:9.4f} ms  {cambio:+7.1f}%  {marca}")
+    for nombre in sorted(set(base) ^ set(nuevo)):
+        print(f"{nombre:45s} solo en {'base' if nombre in base else 'nuevo'}")
+    print(f"{regresiones} regresión(es) por encima de {args.umbral}% en {args.metrica}")
+    return 1 if regresiones else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmarks de Skater Survival")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="corre los micro-benchmarks")
+    p_run.add_argument("-o", metavar="ARCHIVO", help="guardar resultados en JSON")
+    p_run.add_argument("-n", type=int, default=200, help="muestras por benchmark")
+    p_run.add_argument("-k", metavar="FILTRO", help="solo benchmarks cuyo nombre contenga FILTRO")
+    p_run.set_defaults(fn=_run)
+
+    p_cmp = sub.add_parser("compare", help="compara dos archivos de resultados")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("nuevo")
+    p_cmp.add_argument("--umbral", type=float, default=10.0, help="%% de empeoramiento que cuenta como regresión")
+    p_cmp.add_argument("--metrica", default="p50_ms", choices=["mean_ms", "p50_ms", "p99_ms"])
+    p_cmp.set_defaults(fn=_compare)
+
+    p_carga = sub.add_parser("carga", help="escenarios de carga del bucle completo con presupuesto de p99")
+    p_carga.add_argument("-o", metavar="ARCHIVO", help="guardar resultados en JSON (comparables con compare)")
+    p_carga.add_argument("-k", metavar="FILTRO", help="solo escenarios cuyo nombre contenga FILTRO")
+    p_carga.add_argument("--ticks", type=int, default=600, help="frames por escenario")
+    p_carga.add_argument("--backend", default="objetos", choices=["objetos", "numpy"])
+    p_carga.add_argument("--calidad", type=float, nargs="?", const=0.0, metavar="MS",
+                         help="con el gobernador de calidad (presupuesto MS; por defecto el del juego)")
+    p_carga.set_defaults(fn=_carga)
+
+    p_ver = sub.add_parser("verificar", help="comprueba que el backend numpy coincide con el de objetos")
+    p_ver.add_argument("--partidas", type=int, default=200, help="partidas sembradas a comparar")
+    p_ver.add_argument("--max-ticks", type=int, default=5000, help="corta cada partida tras N ticks")
+    p_ver.add_argument("--lote", action="store_true",
+                       help="compara SimulacionLote (core.simulacion_np) con GameSimulation")
+    p_ver.add_argument("--bot", default="torpe", help="bot que juega las partidas de --lote")
+    p_ver.add_argument("--calidad", action="store_true",
+                       help="comprueba que el gobernador de calidad no oscila entre dos niveles")
+    p_ver.add_argument("--baselines", action="store_true",
+                       help="comprueba los baselines de FrameMeta contra la fila opaca más baja de cada frame")
+    p_ver.set_defaults(fn=_verificar)
+
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
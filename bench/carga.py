@@ -0,0 +1,204 @@
+# bench/carga.py
+"""
+Pruebas de carga: el bucle real del juego (sim.step + dibujar_juego + flip) sin
+ventana, en escenarios sintéticos extremos, con presupuesto de tiempo por frame.
+
+    python -m bench carga [-k filtro] [--ticks 600] [--backend objetos|numpy] [--calidad [MS]] [-o res.json]
+
+Cada escenario fija sus condiciones en todos los ticks (nivel/velocidad, spawns extra,
+ítems en pantalla, overlays) y mide el frame completo. Si el p99 de un escenario supera
+su presupuesto, o si no llega a tener en pantalla los obstáculos/ítems que pide (media
+por frame 0: el escenario no mediría nada), el comando sale con código 1. Los tiempos por etapa salen del
+FrameProfiler del juego, para ver qué parte se rompe primero. Con --calidad cada
+escenario corre con el gobernador de calidad (core/calidad.py), con presupuesto MS si se da.
+"""
+import random
+import time
+from collections import namedtuple
+
+import pygame
+
+from bench import resumir
+
+Escenario = namedtuple("Escenario", ["nombre", "nivel", "densidad", "items", "overlays", "presupuesto_p99_ms"])
+
+PRESUPUESTO_P99_MS = 33.0
+
+ESCENARIOS = (
+    Escenario("base", 1, 1, 0, False, PRESUPUESTO_P99_MS),
+    Escenario("nivel30", 30, 1, 0, False, PRESUPUESTO_P99_MS),
+    Escenario("densidad_x10", 1, 10, 0, False, PRESUPUESTO_P99_MS),
+    Escenario("items_300", 1, 1, 300, False, PRESUPUESTO_P99_MS),
+    Escenario("overlays", 1, 1, 0, True, PRESUPUESTO_P99_MS),
+    Escenario("todo", 30, 10, 300, True, PRESUPUESTO_P99_MS),
+)
+
+# ticks entre spawns de obstáculos en una partida normal (ver generar_obstaculos)
+_INTERVALO_SPAWN = 35
+
+# tope de la velocidad forzada (px/tick): a nivel 30 serían ~9700 px/tick y todo saldría de
+# pantalla el mismo tick en que aparece; con 60 cada entidad cruza la pantalla en ~22 ticks
+VELOCIDAD_MAX_FORZADA = 60.0
+
+
+def _velocidad_nivel(nivel):
+    from core.poderes import VELOCIDAD_INICIAL, MULTIPLICADOR_VELOCIDAD
+    return min(VELOCIDAD_MAX_FORZADA, VELOCIDAD_INICIAL * MULTIPLICADOR_VELOCIDAD ** (nivel - 1))
+
+
+def _visibles(entidades):
+    from settings import ANCHO
+    return sum(1 for e in entidades if e.rect.right > 0 and e.rect.left < ANCHO)
+
+
+class _Forzador:
+    """Reaplica las condiciones de un escenario sobre la simulación antes de cada tick."""
+
+    def __init__(self, sim, escenario, rng):
+        self.sim = sim
+        self.esc = escenario
+        self.rng = rng
+        self.velocidad = _velocidad_nivel(escenario.nivel)
+        self._spawns_pendientes = 0.0
+
+    def aplicar(self):
+        from core.simulacion import generar_obstaculos
+        from core.item import POOL_ITEMS
+        from settings import ANCHO
+        sim, esc, estado, poderes = self.sim, self.esc, self.sim.estado, self.sim.poderes
+        ahora = sim.ahora
+
+        # nivel fijo (la rampa no avanza) y sin muertes: la partida dura lo que pida el escenario
+        estado.nivel = esc.nivel
+        estado.velocidad = self.velocidad
+        if not estado.invulnerable or estado.tiempo_invulnerable - ahora < 1000:
+            poderes.poner_invulnerable(ahora, 10000, estado.color_invul)
+
+        # densidad x N: (N-1) spawns extra cada _INTERVALO_SPAWN ticks, repartidos
+        self._spawns_pendientes += (esc.densidad - 1) / _INTERVALO_SPAWN
+        while self._spawns_pendientes >= 1.0:
+            generar_obstaculos(sim.obstaculos, sim.tiempo, -_INTERVALO_SPAWN, self.rng)
+            self._spawns_pendientes -= 1.0
+
+        # ítems: se repone hasta tener esc.items en pantalla
+        jugador = sim.jugador.rect
+        faltan = esc.items - len(sim.items)
+        for _ in range(max(0, faltan)):
+            item = POOL_ITEMS.adquirir(self.rng)
+            item.rect.x = self.rng.randint(jugador.right + 20, ANCHO + 400)
+            item.rect.y = jugador.centery - item.rect.height // 2
+            item.prev_x = item.rect.x
+            sim.items.append(item)
+
+        if esc.overlays:
+            estado.escudo = True
+            if not estado.revelando:
+                poderes.empezar_revelacion(ahora, "escudo")
+            if not estado.stack:
+                estado.stack.append("misterioso")
+            estado.contador_stack = 3
+            for destello in ("reduccion", "subida", "desvalijado"):
+                if not getattr(estado, "mostrar_" + destello):
+                    poderes.mostrar_destello(destello, ahora)
+
+
+def correr_escenario(ctx, escenario, ticks=600, backend="objetos", semilla=0, gobernador=None):
+    """
+    Juega `ticks` frames del escenario y devuelve (resumen_ms, {etapa: (p50, p99)}); el resumen
+    incluye la media de obstáculos e ítems visibles por frame (obstaculos_visibles, items_visibles).
+    gobernador: GobernadorCalidad opcional; cada frame se dibuja con su calidad y se le registra.
+    """
+    from core.simulacion import GameSimulation, Entrada
+    from core.perfil import FrameProfiler
+    from core.calidad import CALIDAD_MAXIMA
+    main = ctx.main
+    perfil = FrameProfiler(capacidad=ticks)
+    perfil.activo = True
+    sim = GameSimulation(sprite=ctx.sprite, escala=ctx.escala, semilla=semilla, perfil=perfil, backend=backend)
+    forzador = _Forzador(sim, escenario, random.Random(semilla))
+    entradas = random.Random(semilla + 1)
+    reloj = time.perf_counter
+    muestras = []
+    obstaculos = items = 0
+    for _ in range(ticks):
+        # las condiciones del escenario se fuerzan fuera del tiempo medido
+        forzador.aplicar()
+        t0 = reloj()
+        perfil.inicio_frame()
+        pygame.event.pump()
+        perfil.marca("input")
+        sim.step(Entrada(entradas.random() < 0.05, entradas.random() < 0.3))
+        calidad = gobernador.calidad if gobernador is not None else CALIDAD_MAXIMA
+        main.dibujar_juego(ctx.ventana, sim, ctx.fondo, ctx.fuente, 0, 1, perfil=perfil, calidad=calidad)
+        pygame.display.flip()
+        perfil.marca("flip")
+        perfil.fin_frame()
+        muestras.append((reloj() - t0) * 1000.0)
+        if gobernador is not None:
+            gobernador.registrar(muestras[-1])
+        # lo que se dibujó en este frame (fuera del tiempo medido)
+        obstaculos += _visibles(sim.obstaculos)
+        items += _visibles(sim.items)
+    etapas = perfil.estadisticas()
+    sim.obstaculos.clear()
+    sim.items.clear()
+    resumen = resumir(muestras)
+    resumen["obstaculos_visibles"] = obstaculos / ticks if ticks else 0.0
+    resumen["items_visibles"] = items / ticks if ticks else 0.0
+    return resumen, etapas
+
+
+class Contexto:
+    """Ventana dummy, fondo, fuente y el sprite del primer personaje, cargados una vez."""
+
+    def __init__(self):
+        import main
+        from settings import ANCHO, ALTO
+        from core.utils import obtener_fuente
+        self.main = main
+        self.ventana = pygame.display.set_mode((ANCHO, ALTO))
+        self.fondo = main.cargar_background()
+        self.fuente = obtener_fuente(None, 30)
+        anims = main.cargar_animaciones()
+        char = next(iter(anims), None)
+        self.sprite = {k: a for k, a in anims[char].items() if a} if char else None
+        self.escala = main.SCALE_BY_CHAR.get(char, 1.8)
+
+
+def ejecutar(filtro=None, ticks=600, backend="objetos", log=print, calidad_adaptativa=False, presupuesto_ms=None):
+    """
+    Corre los escenarios (los que contengan `filtro`); devuelve ({nombre: resumen}, [nombres fuera de presupuesto]).
+    calidad_adaptativa: cada escenario corre con su propio GobernadorCalidad (con presupuesto_ms
+    si se da); el nivel final y sus cambios se añaden al resumen.
+    """
+    from core.calidad import GobernadorCalidad
+    if not pygame.get_init():
+        pygame.init()
+    ctx = Contexto()
+    resultados = {}
+    fuera = []
+    for esc in ESCENARIOS:
+        if filtro and filtro not in esc.nombre:
+            continue
+        gobernador = None
+        if calidad_adaptativa:
+            gobernador = GobernadorCalidad(presupuesto_ms) if presupuesto_ms else GobernadorCalidad()
+        r, etapas = correr_escenario(ctx, esc, ticks, backend, gobernador=gobernador)
+        nombre = f"carga[{esc.nombre}]"
+        if gobernador is not None:
+            st = gobernador.stats()
+            r["calidad"] = st["calidad"]
+            r["cambios_calidad"] = st["cambios"]
+        resultados[nombre] = r
+        excede = r["p99_ms"] > esc.presupuesto_p99_ms
+        # un escenario sin nada en pantalla no carga el frame: cuenta como fallo
+        vacio = r["obstaculos_visibles"] == 0 or (esc.items > 0 and r["items_visibles"] == 0)
+        if excede or vacio:
+            fuera.append(nombre)
+        peor = sorted((e for e in etapas if e != "total"), key=lambda e: etapas[e][1], reverse=True)[:3]
+        detalle = ", ".join(f"{e} {etapas[e][1]:.1f}" for e in peor)
+        log(f"{nombre:24s} p50 {r['p50_ms']:7.2f}  p99 {r['p99_ms']:7.2f}  max {r['max_ms']:7.2f} ms"
+            f"  (presupuesto p99 {esc.presupuesto_p99_ms:.0f})  {'VACIO' if vacio else 'FUERA' if excede else 'ok':5s}"
+            f"  visibles {r['obstaculos_visibles']:.1f} obst / {r['items_visibles']:.1f} ítems  p99 etapas: {detalle}"
+            + (f"  calidad final {r['calidad']} ({r['cambios_calidad']} cambios)" if gobernador is not None else ""))
+    return resultados, fuera
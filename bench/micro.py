@@ -0,0 +1,233 @@
+# bench/micro.py
+"""Micro-benchmarks: cada función aislada, con los assets reales del repo."""
+import random
+
+import pygame
+
+from bench import medir
+
+_BENCHMARKS = []
+
+
+def benchmark(nombre):
+    """Registra fn(ctx) -> callable (o (callable, preparar)) bajo `nombre`."""
+    def deco(fn):
+        if all(n != nombre for n, _ in _BENCHMARKS):
+            _BENCHMARKS.append((nombre, fn))
+        return fn
+    return deco
+
+
+class _RngSiempreSpawnea(random.Random):
+    """random() siempre 0: generar_items nunca sale por probabilidad (mide el camino de spawn)."""
+    def random(self):
+        return 0.0
+
+
+class Contexto:
+    """Ventana dummy y assets cargados una sola vez para todos los benchmarks."""
+
+    def __init__(self):
+        import main
+        from settings import ANCHO, ALTO
+        self.main = main
+        self.ventana = pygame.display.set_mode((ANCHO, ALTO))
+        self.fondo = main.cargar_background()
+        self.anims = main.cargar_animaciones()
+        from core.utils import obtener_fuente
+        self.fuente = obtener_fuente(None, 30)
+
+
+@benchmark("dibujar_background")
+def _bg(ctx):
+    return lambda: ctx.main.dibujar_background(ctx.ventana, ctx.fondo, 15.0, 1.0)
+
+
+def _bench_player(char, key):
+    def crear(ctx):
+        from core.player import Player
+        anims = {k: v for k, v in ctx.anims.get(char, {}).items() if v}
+        if key not in anims:
+            return None
+        jugador = Player()
+        jugador.set_sprite(anims, ctx.main.SCALE_BY_CHAR.get(char, 1.8))
+        anim = anims[key]
+
+        def preparar():
+            # forzamos la animación y avanzamos de frame como en el juego
+            jugador.current_anim_key = key
+            anim.index = (anim.index + 1) % len(anim.frames)
+        return (lambda: jugador.dibujar(ctx.ventana)), preparar
+    return crear
+
+
+def _registrar_players():
+    import main
+    for char, sheets in main.CHAR_SHEETS.items():
+        for key in sheets:
+            benchmark(f"Player.dibujar[{char}:{key}]")(_bench_player(char, key))
+
+
+@benchmark("Obstaculo.__init__")
+def _obs_init(ctx):
+    from core.obstaculo import Obstaculo
+    rng = random.Random(1)
+    return lambda: Obstaculo(rng.choice(["techo", "suelo"]), rng=rng)
+
+
+@benchmark("Obstaculo.dibujar")
+def _obs_dibujar(ctx):
+    from core.obstaculo import Obstaculo
+    rng = random.Random(2)
+    obstaculos = [Obstaculo(t, rng=rng) for t in ("techo", "suelo") * 8]
+    it = iter(range(1 << 62))
+
+    def fn():
+        obstaculos[next(it) % len(obstaculos)].dibujar(ctx.ventana)
+    return fn
+
+
+@benchmark("Item.dibujar")
+def _item_dibujar(ctx):
+    from core.item import Item
+    rng = random.Random(3)
+    items = [Item(rng) for _ in range(16)]
+    it = iter(range(1 << 62))
+
+    def fn():
+        items[next(it) % len(items)].dibujar(ctx.ventana)
+    return fn
+
+
+@benchmark("dibujar_texto")
+def _texto(ctx):
+    from core.utils import dibujar_texto
+    return lambda: dibujar_texto(ctx.ventana, "Récord tiempo: 123s", ctx.fuente, (200, 200, 200), (20, 80))
+
+
+@benchmark("CapaEfectos.dibujar[3 activos]")
+def _efectos(ctx):
+    from core.efectos import CapaEfectos
+    capa = CapaEfectos()
+    activos = [("reduccion", 500), ("subida", 500), ("desvalijado", 500)]
+    return lambda: capa.dibujar(ctx.ventana, activos, 0, ctx.fuente)
+
+
+@benchmark("generar_items")
+def _gen_items(ctx):
+    from core.simulacion import generar_items
+    from core.item import POOL_ITEMS
+    from core.obstaculo import Obstaculo
+    rng = _RngSiempreSpawnea(4)
+    obstaculos = [Obstaculo("suelo", offset_x=i * 150, rng=rng) for i in range(4)]
+    jugador_rect = pygame.Rect(100, 700, 95, 95)
+    items = []
+
+    def preparar():
+        for item in items:
+            POOL_ITEMS.liberar(item)
+        items.clear()
+    return (lambda: generar_items(items, obstaculos, 10000, 0, 5, jugador_rect, rng)), preparar
+
+
+@benchmark("POOL_OBSTACULOS.adquirir+liberar")
+def _pool(ctx):
+    from core.obstaculo import POOL_OBSTACULOS
+    rng = random.Random(5)
+
+    def fn():
+        POOL_OBSTACULOS.liberar(POOL_OBSTACULOS.adquirir("techo", 0, rng))
+    return fn
+
+
+def _bench_mundo(backend):
+    def crear(ctx):
+        from core.simulacion import GameSimulation
+        from core.obstaculo import POOL_OBSTACULOS
+        try:
+            sim = GameSimulation(semilla=6, backend=backend)
+        except (ImportError, RuntimeError):
+            return None
+        rng = random.Random(6)
+        jugador = sim.jugador.rect
+
+        def preparar():
+            # 200 obstáculos repartidos delante del jugador, varios encima de él
+            sim.obstaculos.clear()
+            for i in range(200):
+                sim.obstaculos.append(POOL_OBSTACULOS.adquirir(rng.choice(("suelo", "techo")), i * 40 - 1400, rng))
+
+        def fn():
+            sim.obstaculos.mover(15)
+            sim.obstaculos.retirar_fuera()
+            sim.obstaculos.colisiones(jugador)
+        return fn, preparar
+    return crear
+
+
+for _backend in ("objetos", "numpy"):
+    benchmark(f"mundo[{_backend}] mover+retirar+colisiones x200")(_bench_mundo(_backend))
+
+
+def _bench_lote(n):
+    def crear(ctx):
+        from core.simulacion_np import SimulacionLote, disponible
+        if not disponible():
+            return None
+        import numpy as np
+        lote = SimulacionLote(range(n))
+        entradas = np.random.default_rng(n)
+        siguiente = [n]
+
+        def preparar():
+            # las que terminaron empiezan otra partida: el lote siempre está lleno
+            fin = np.flatnonzero(lote.game_over)
+            if len(fin):
+                lote.reiniciar(fin, range(siguiente[0], siguiente[0] + len(fin)))
+                siguiente[0] += len(fin)
+
+        return (lambda: lote.step(entradas.random(n) < 0.05, entradas.random(n) < 0.3)), preparar
+    return crear
+
+
+for _n in (256, 1024):
+    benchmark(f"SimulacionLote.step[{_n}]")(_bench_lote(_n))
+
+
+def _bench_sheet(ruta):
+    def crear(ctx):
+        from core.sprites import AnimatedSprite
+        surf = pygame.image.load(ruta).convert_alpha()
+        return lambda: AnimatedSprite(surf)
+    return crear
+
+
+def _registrar_sheets():
+    import os
+    import main
+    for sheets in main.CHAR_SHEETS.values():
+        for fname in sheets.values():
+            ruta = os.path.join(main.SPRITE_DIR, fname)
+            if os.path.isfile(ruta):
+                benchmark(f"AnimatedSprite[{fname}]")(_bench_sheet(ruta))
+
+
+def ejecutar(filtro=None, repeticiones=200, log=print):
+    """Corre los benchmarks (los que contengan `filtro`) y devuelve {nombre: resumen}."""
+    if not pygame.get_init():
+        pygame.init()
+    _registrar_players()
+    _registrar_sheets()
+    ctx = Contexto()
+    resultados = {}
+    for nombre, crear in _BENCHMARKS:
+        if filtro and filtro not in nombre:
+            continue
+        creado = crear(ctx)
+        if creado is None:
+            continue
+        fn, preparar = creado if isinstance(creado, tuple) else (creado, None)
+        resultados[nombre] = medir(fn, repeticiones, preparar=preparar)
+        r = resultados[nombre]
+        log(f"{nombre:45s} mean {r['mean_ms']:8.4f} ms  p50 {r['p50_ms']:8.4f}  p99 {r['p99_ms']:8.4f}")
+    return resultados
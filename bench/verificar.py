@@ -0,0 +1,160 @@
+# bench/verificar.py
+"""
+Comprobaciones de equivalencia (el repo no tiene suite de tests: se corren desde aquí).
+
+    python -m bench verificar [--partidas 200] [--max-ticks 5000] [--lote [--bot torpe] | --calidad | --baselines]
+
+backends: juega las mismas partidas sembradas con GameSimulation(backend="objetos") y
+backend="numpy" con la misma secuencia de entrada y compara, tick a tick, la huella,
+el estado y los rects/tipos de obstáculos e ítems (mismo orden). Cualquier diferencia
+en la semántica de colisión (bordes, hitbox, orden de impacto) sale aquí.
+
+lote (--lote): SimulacionLote contra GameSimulation, partida a partida (ver verificar_lote).
+calidad (--calidad): el backoff del GobernadorCalidad (ver verificar_calidad).
+baselines (--baselines): FrameMeta.baseline de cada frame de assets/players (ver verificar_baselines).
+"""
+import random
+
+
+def _foto(sim):
+    from core.replay import huella
+    return (huella(sim), sim.estado.como_dict(),
+            [(tuple(o.rect), o.tipo) for o in sim.obstaculos],
+            [(tuple(i.rect), i.tipo) for i in sim.items])
+
+
+def verificar_backends(partidas=200, max_ticks=5000, log=print):
+    """Devuelve la lista de (semilla, tick) donde los backends divergen (vacía si coinciden)."""
+    from core.simulacion import GameSimulation, Entrada
+    fallos = []
+    ticks = 0
+    for semilla in range(partidas):
+        a = GameSimulation(semilla=semilla, backend="objetos")
+        b = GameSimulation(semilla=semilla, backend="numpy")
+        entradas = random.Random(semilla)
+        while True:
+            e = Entrada(entradas.random() < 0.05, entradas.random() < 0.3)
+            fin_a = a.step(e)
+            fin_b = b.step(e)
+            ticks += 1
+            if fin_a != fin_b or _foto(a) != _foto(b):
+                fallos.append((semilla, a.frame_count))
+                log(f"semilla {semilla}: divergen en el tick {a.frame_count}")
+                break
+            if fin_a or a.frame_count >= max_ticks:
+                break
+    log(f"backends: {partidas} partidas, {ticks} ticks, {len(fallos)} divergencia(s)")
+    return fallos
+
+
+def _foto_escalar(sim):
+    e = sim.estado
+    j = sim.jugador
+    return (sim.frame_count, sim.game_over, sim.causa_muerte, e.nivel, e.velocidad,
+            j.rect.y, j.rect.height, j.velocidad_y, j.en_suelo, j.agachado,
+            e.escudo, e.invulnerable, e.tiempo_invulnerable, e.revelando, e.efecto_revelado, e.tiempo_revelacion,
+            list(e.stack), e.contador_stack, e.tiempo_contador, dict(sim.poderes.aplicados),
+            # EntityStore solo retira desde el principio: los que ya salieron pueden seguir un tick más
+            [(o.rect.x, o.rect.y, o.rect.width, o.rect.height, o.tipo) for o in sim.obstaculos if o.rect.right >= 0],
+            [(i.rect.x, i.rect.y, i.rect.width, i.rect.height, i.tipo) for i in sim.items if i.rect.right >= 0])
+
+
+def _foto_lote(lote, g):
+    from core.simulacion_np import TIPOS_OBSTACULO, TIPOS_ITEM
+    return (int(lote.frame_count[g]), bool(lote.game_over[g]), lote.causa_muerte(g), int(lote.nivel[g]),
+            float(lote.velocidad[g]), int(lote.jugador_y[g]), int(lote.jugador_h[g]), float(lote.velocidad_y[g]),
+            bool(lote.en_suelo[g]), bool(lote.agachado[g]), bool(lote.escudo[g]), bool(lote.invulnerable[g]),
+            float(lote.tiempo_invulnerable[g]), bool(lote.revelando[g]), lote.efecto_revelado[g],
+            float(lote.tiempo_revelacion[g]), list(lote.stacks[g]), int(lote.contador_stack[g]),
+            float(lote.tiempo_contador[g]), dict(lote.aplicados[g]),
+            lote.obstaculos.filas(g, TIPOS_OBSTACULO), lote.items.filas(g, TIPOS_ITEM))
+
+
+def verificar_lote(partidas=200, max_ticks=5000, bot="torpe", log=print):
+    """
+    lote: SimulacionLote con las semillas 0..partidas-1 contra una GameSimulation por
+    semilla; un bot de core.bots juega la escalar y sus entradas se pasan a las dos.
+    Compara el estado de cada partida tick a tick y devuelve [(semilla, tick)] donde divergen.
+    """
+    import numpy as np
+    from core.simulacion import GameSimulation
+    from core.simulacion_np import SimulacionLote
+    from core.bots import crear_bot
+    lote = SimulacionLote(range(partidas))
+    sims = [GameSimulation(semilla=s) for s in range(partidas)]
+    bots = [crear_bot(bot, random.Random(s ^ 0x5EED)) for s in range(partidas)]
+    vivas = list(range(partidas))
+    fallos = []
+    ticks = 0
+    saltar = np.zeros(partidas, np.bool_)
+    agachar = np.zeros(partidas, np.bool_)
+    while vivas:
+        for g in vivas:
+            e = bots[g].decidir(sims[g])
+            saltar[g], agachar[g] = e.saltar, e.agachar
+            sims[g].step(e)
+        lote.step(saltar, agachar)
+        ticks += len(vivas)
+        siguen = []
+        for g in vivas:
+            sim = sims[g]
+            if _foto_escalar(sim) != _foto_lote(lote, g):
+                fallos.append((g, sim.frame_count))
+                log(f"semilla {g}: divergen en el tick {sim.frame_count}")
+            elif not sim.game_over and sim.frame_count < max_ticks:
+                siguen.append(g)
+        vivas = siguen
+        # las que divergen o llegan a max_ticks se congelan también en el lote
+        lote.game_over[:] = True
+        lote.game_over[vivas] = False
+    log(f"lote: {partidas} partidas, {ticks} ticks, {len(fallos)} divergencia(s)")
+    return fallos
+
+
+def verificar_calidad(frames=600, log=print):
+    """
+    calidad: con frames lentos en el nivel máximo y rápidos en el siguiente, el gobernador
+    baja, recupera el nivel y lo vuelve a perder; la espera para recuperarlo tiene que
+    duplicarse en cada vuelta (si no, oscila entre los dos niveles). Devuelve los fallos.
+    """
+    from core.calidad import GobernadorCalidad
+    gobernador = GobernadorCalidad(presupuesto_ms=30.0)
+    esperas = []
+    for _ in range(frames):
+        gobernador.registrar(40.0 if gobernador.nivel == 0 else 5.0)
+        espera = gobernador.espera_para_subir(0)
+        if not esperas or esperas[-1] != espera:
+            esperas.append(espera)
+    fallos = []
+    if len(esperas) < 3 or any(b != a * 2 for a, b in zip(esperas, esperas[1:])):
+        fallos.append(("espera", esperas))
+        log(f"calidad: la espera para recuperar el nivel no se duplica: {esperas}")
+    log(f"calidad: {frames} frames, {gobernador.cambios} cambios, esperas {esperas}, {len(fallos)} fallo(s)")
+    return fallos
+
+
+def verificar_baselines(log=print):
+    """
+    sprites: para cada sheet de assets/players, el baseline de FrameMeta (calculado con la
+    máscara en AnimatedSprite) tiene que ser la fila de _lowest_nontransparent_row (el
+    recorrido píxel a píxel de antes) en todos los frames. Devuelve [(sheet, frame)] que difieren.
+    """
+    import os
+    import pygame
+    from core.player import _lowest_nontransparent_row
+    from core.sprites import AnimatedSprite
+    carpeta = os.path.join("assets", "players")
+    fallos = []
+    frames = 0
+    for nombre in sorted(os.listdir(carpeta)):
+        if not nombre.lower().endswith(".png"):
+            continue
+        anim = AnimatedSprite(pygame.image.load(os.path.join(carpeta, nombre)))
+        for i, (frame, meta) in enumerate(zip(anim.frames, anim.meta)):
+            frames += 1
+            esperado = _lowest_nontransparent_row(frame)
+            if meta.baseline != esperado:
+                fallos.append((nombre, i))
+                log(f"{nombre} frame {i}: baseline {meta.baseline}, esperado {esperado}")
+    log(f"baselines: {frames} frames, {len(fallos)} diferencia(s)")
+    return fallos
@@ -0,0 +1,97 @@
+# core/assets.py
+"""
+Carga de imágenes en paralelo.
+
+Lo pesado (leer y decodificar el PNG, escalar los fondos, cortar los sheets en frames y
+calcular su FrameMeta) corre en un ThreadPoolExecutor: pygame suelta el GIL mientras
+decodifica, así que los archivos se leen a la vez. Nada de eso toca la ventana; el
+convert_alpha(), que sí depende del formato del display, se hace después en el hilo
+principal (ver convertir).
+
+cargar_en_paralelo recibe las tareas y, mientras esperan, llama al_progresar(hechas, total)
+desde el hilo principal para que se pueda dibujar una pantalla de carga.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import pygame
+from core.sprites import cortar_sheet, calcular_meta
+
+# hilos de decodificación (los archivos son pocos: más hilos no ayudan)
+TRABAJADORES_CARGA = min(8, os.cpu_count() or 2)
+
+# cada cuánto (s) se vuelve al hilo principal a dibujar el progreso
+_PASO_PROGRESO = 1 / 30
+
+
+def _rgba(surf):
+    """Copia en 32 bits con alfa (un PNG con paleta no se puede escalar con smoothscale)."""
+    if surf.get_bitsize() == 32 and surf.get_flags() & pygame.SRCALPHA:
+        return surf
+    out = pygame.Surface(surf.get_size(), pygame.SRCALPHA, 32)
+    out.blit(surf, (0, 0))
+    return out
+
+
+def decodificar_capa(ruta, tamano):
+    """Capa de fondo escalada (manteniendo proporción) para cubrir al menos `tamano`."""
+    surf = pygame.image.load(ruta)
+    w, h = surf.get_size()
+    if w == 0 or h == 0:
+        raise ValueError("background con tamaño inválido")
+    ancho, alto = tamano
+    scale = max(ancho / w, alto / h)
+    return pygame.transform.smoothscale(_rgba(surf), (max(1, int(w * scale)), max(1, int(h * scale))))
+
+
+def decodificar_sheet(ruta, frame_w=None):
+    """(frames, metas) de un sheet horizontal, sin convertir al formato de la ventana."""
+    frames = cortar_sheet(pygame.image.load(ruta), frame_w)
+    return frames, [calcular_meta(f) for f in frames]
+
+
+def convertir(surf):
+    """convert_alpha() si hay ventana (solo desde el hilo principal)."""
+    if pygame.display.get_surface() is not None:
+        return surf.convert_alpha()
+    return surf
+
+
+def cargar_en_paralelo(tareas, al_progresar=None, trabajadores=None):
+    """
+    tareas: {clave: (fn, *args)}. Devuelve {clave: resultado}; si una tarea falla, su
+    resultado es la excepción (quien arma los assets decide qué hacer con ella).
+    """
+    resultados = {}
+    if not tareas:
+        return resultados
+    total = len(tareas)
+    with ThreadPoolExecutor(max_workers=trabajadores or TRABAJADORES_CARGA,
+                            thread_name_prefix="assets") as pool:
+        pendientes = {pool.submit(fn, *args): clave for clave, (fn, *args) in tareas.items()}
+        while pendientes:
+            if al_progresar:
+                al_progresar(total - len(pendientes), total)
+            hechas, _ = wait(pendientes, timeout=_PASO_PROGRESO, return_when=FIRST_COMPLETED)
+            for futuro in hechas:
+                clave = pendientes.pop(futuro)
+                try:
+                    resultados[clave] = futuro.result()
+                except Exception as e:
+                    resultados[clave] = e
+    if al_progresar:
+        al_progresar(total, total)
+    return resultados
+
+
+class Cronometro:
+    """Marcas de tiempo (ms desde `inicio`) para el reporte de arranque."""
+
+    def __init__(self, inicio=None):
+        self.inicio = inicio if inicio is not None else time.perf_counter()
+        self.marcas = {}
+
+    def marca(self, nombre):
+        self.marcas[nombre] = (time.perf_counter() - self.inicio) * 1000.0
+        return self.marcas[nombre]
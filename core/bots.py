@@ -0,0 +1,157 @@
+# core/bots.py
+"""
+Políticas de control para jugar partidas sin teclado (lotes, bench, agentes).
+
+Un bot es una clase registrada con @registrar_bot: se crea una por partida con su
+propio random.Random (distinto del de la simulación, así que el bot no cambia los
+spawns) y decidir(sim) devuelve la Entrada del tick siguiente.
+
+crear_bot acepta el nombre de un bot registrado o "modulo:Clase" para usar uno de fuera
+del repo sin tocarlo.
+"""
+import importlib
+import random
+
+from core.simulacion import Entrada, SIN_ENTRADA
+
+BOTS = {}
+
+
+def registrar_bot(cls):
+    """Decorador: registra la clase del bot bajo cls.nombre."""
+    BOTS[cls.nombre] = cls
+    return cls
+
+
+def crear_bot(nombre, rng=random):
+    """Instancia del bot `nombre` (registrado o "modulo:Clase")."""
+    if ":" in nombre:
+        modulo, clase = nombre.split(":", 1)
+        cls = getattr(importlib.import_module(modulo), clase)
+    else:
+        try:
+            cls = BOTS[nombre]
+        except KeyError:
+            raise ValueError(f"bot desconocido: {nombre!r} (disponibles: {', '.join(BOTS)})") from None
+    return cls(rng)
+
+
+def proximos_obstaculos(sim, n=2):
+    """
+    Los n obstáculos más cercanos que el jugador aún no dejó atrás, de más cerca a más
+    lejos: [(distancia, obstáculo)], con la distancia en px desde el borde derecho del
+    jugador hasta la hitbox (negativa si ya se solapan en x).
+    """
+    jugador = sim.jugador.rect
+    delante = []
+    for o in sim.obstaculos:
+        hitbox = o.hitbox
+        if hitbox.right > jugador.left:
+            delante.append((hitbox.left - jugador.right, o))
+    delante.sort(key=lambda d: d[0])
+    return delante[:n]
+
+
+class Bot:
+    nombre = ""
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def decidir(self, sim):
+        raise NotImplementedError
+
+
+@registrar_bot
+class Quieto(Bot):
+    """No hace nada (la partida dura lo que tarde el primer obstáculo)."""
+    nombre = "quieto"
+
+    def decidir(self, sim):
+        return SIN_ENTRADA
+
+
+@registrar_bot
+class Aleatorio(Bot):
+    """Las mismas probabilidades que usan bench carga y bench verificar."""
+    nombre = "aleatorio"
+
+    def decidir(self, sim):
+        return Entrada(self.rng.random() < 0.05, self.rng.random() < 0.3)
+
+
+_TRAYECTORIA = None
+
+
+def trayectoria_salto():
+    """Alturas (px sobre el suelo) del jugador en cada tick de un salto, con la física de Player."""
+    global _TRAYECTORIA
+    if _TRAYECTORIA is None:
+        from core.player import Player
+        jugador = Player()
+        suelo = jugador.rect.bottom
+        jugador.aplicar_entrada(True, False)
+        alturas = []
+        while True:
+            jugador.mover()
+            if jugador.en_suelo:
+                break
+            alturas.append(suelo - jugador.rect.bottom)
+        _TRAYECTORIA = tuple(alturas)
+    return _TRAYECTORIA
+
+
+@registrar_bot
+class Reactivo(Bot):
+    """
+    Se agacha bajo los obstáculos de techo cuando llegan en menos de `anticipacion_techo`
+    ticks, y salta los de suelo en cuanto un salto iniciado ahora los pasa sin tocar
+    ninguno de los obstáculos que ve (simula la trayectoria de Player contra sus hitbox a
+    la velocidad actual). `error` es la probabilidad de no reaccionar en un tick (una vez
+agachado no se levanta por error).
+    """
+    nombre = "reactivo"
+    anticipacion_techo = 2
+    vistos = 3
+    error = 0.0
+
+    def _salto_seguro(self, sim, delante, velocidad):
+        jugador = sim.jugador.rect
+        for t, altura in enumerate(trayectoria_salto(), 1):
+            bottom = jugador.bottom - altura
+            for _, o in delante:
+                hitbox = o.hitbox
+                left = hitbox.left - t * velocidad
+                if left >= jugador.right or left + hitbox.width <= jugador.left:
+                    continue
+                if o.tipo == "techo" or bottom > hitbox.top:
+                    return False
+        return True
+
+    def decidir(self, sim):
+        delante = proximos_obstaculos(sim, self.vistos)
+        if not delante or not sim.jugador.en_suelo:
+            return SIN_ENTRADA
+        if self.error and not sim.jugador.agachado and self.rng.random() < self.error:
+            return SIN_ENTRADA
+        velocidad = int(sim.estado.velocidad)
+        distancia, o = delante[0]
+        if o.tipo == "techo":
+            if distancia <= velocidad * self.anticipacion_techo:
+                return Entrada(False, True)
+            return SIN_ENTRADA
+        alcance = velocidad * len(trayectoria_salto())
+        if distancia <= alcance:
+            if self._salto_seguro(sim, delante, velocidad):
+                return Entrada(True, False)
+            # si esperar un tick más ya no deja tiempo para subir, se salta igual
+            if distancia - velocidad < velocidad * 3:
+                return Entrada(True, False)
+        return SIN_ENTRADA
+
+
+@registrar_bot
+class Torpe(Reactivo):
+    """Reactivo que no reacciona un 30 % de los ticks (partidas más cortas y variadas)."""
+    nombre = "torpe"
+    error = 0.3
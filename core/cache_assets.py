@@ -0,0 +1,213 @@
+# core/cache_assets.py
+"""
+Cache en disco de assets ya procesados.
+
+Cada imagen de origen queda como dos archivos en CACHE_DIR:
+  <nombre>.<clave>.rgba  píxeles RGBA crudos de todas sus superficies, uno tras otro
+                         (se abre con mmap y cada superficie es una vista, sin decodificar)
+  <nombre>.<clave>.json  tamaños/offsets de cada superficie y la FrameMeta de cada frame
+
+La clave es un hash del contenido del archivo de origen, la resolución / altos a los
+que se escaló y VERSION_CACHE: si cambia cualquiera, la entrada vieja no se encuentra,
+se reprocesa y se borra al escribir la nueva.
+
+Fondos: la capa escalada para cubrir la pantalla y su AnalisisCapa (opaca / filas visibles). Sheets: los frames cortados, su
+FrameMeta y los frames ya escalados a los altos del jugador (de pie y agachado) para
+su SCALE_BY_CHAR, que Player usa en vez de hacer smoothscale.
+
+Construir la cache sin abrir el juego (en paralelo):
+    python -m core.cache_assets [--limpiar] [--hilos N]
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+import pygame
+from core.sprites import FrameMeta, escalar_frame
+from core.fondo import AnalisisCapa, analizar_capa
+from core.assets import decodificar_capa, decodificar_sheet, cargar_en_paralelo
+
+CACHE_DIR = os.path.join("cache", "assets")
+VERSION_CACHE = 1
+
+# False desactiva la cache (se decodifica siempre y no se escribe nada)
+CACHE_ACTIVA = True
+
+_PNG_FIRMA = b"\x89PNG\r\n\x1a\n"
+
+
+def hash_archivo(ruta):
+    with open(ruta, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def alto_png(ruta):
+    """Alto de un PNG leyendo solo la cabecera (None si no es PNG o no se puede leer)."""
+    try:
+        with open(ruta, "rb") as f:
+            cabecera = f.read(24)
+    except OSError:
+        return None
+    if len(cabecera) < 24 or not cabecera.startswith(_PNG_FIRMA):
+        return None
+    return struct.unpack(">I", cabecera[20:24])[0]
+
+
+def _nombre(ruta):
+    carpeta = os.path.basename(os.path.dirname(ruta))
+    return f"{carpeta}__{os.path.basename(ruta)}" if carpeta else os.path.basename(ruta)
+
+
+def _clave(ruta, *parametros):
+    h = hashlib.sha1(hash_archivo(ruta).encode())
+    h.update(repr((VERSION_CACHE,) + parametros).encode())
+    return h.hexdigest()[:16]
+
+
+def _escribir(directorio, nombre, clave, superficies, extra):
+    """Guarda las superficies (dict grupo -> lista) en .rgba y el índice en .json."""
+    os.makedirs(directorio, exist_ok=True)
+    base = os.path.join(directorio, f"{nombre}.{clave}")
+    indice = {"version": VERSION_CACHE, "grupos": {}}
+    indice.update(extra)
+    offset = 0
+    with open(base + ".rgba.tmp", "wb") as f:
+        for grupo, lista in superficies.items():
+            entradas = []
+            for surf in lista:
+                datos = pygame.image.tobytes(surf, "RGBA")
+                f.write(datos)
+                entradas.append([offset, surf.get_width(), surf.get_height()])
+                offset += len(datos)
+            indice["grupos"][grupo] = entradas
+    with open(base + ".json.tmp", "w", encoding="utf-8") as f:
+        json.dump(indice, f)
+    os.replace(base + ".rgba.tmp", base + ".rgba")
+    os.replace(base + ".json.tmp", base + ".json")
+    # las entradas de versiones anteriores del mismo archivo ya no sirven
+    for fname in os.listdir(directorio):
+        if fname.startswith(nombre + ".") and not fname.startswith(f"{nombre}.{clave}."):
+            try:
+                os.remove(os.path.join(directorio, fname))
+            except OSError:
+                pass
+
+
+def _leer(directorio, nombre, clave):
+    """(indice, {grupo: [Surface]}) con superficies que son vistas del mmap, o None si no está."""
+    base = os.path.join(directorio, f"{nombre}.{clave}")
+    try:
+        with open(base + ".json", encoding="utf-8") as f:
+            indice = json.load(f)
+        if indice.get("version") != VERSION_CACHE:
+            return None
+        with open(base + ".rgba", "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    vista = memoryview(mm)
+    grupos = {}
+    for grupo, entradas in indice["grupos"].items():
+        grupos[grupo] = [pygame.image.frombuffer(vista[o:o + w * h * 4], (w, h), "RGBA")
+                         for o, w, h in entradas]
+    return indice, grupos
+
+
+def _guardar(directorio, nombre, clave, superficies, extra=None):
+    try:
+        _escribir(directorio, nombre, clave, superficies, extra or {})
+    except OSError as e:
+        print(f"[WARN] no se pudo escribir la cache de '{nombre}': {e}")
+
+
+def capa(ruta, tamano, directorio=CACHE_DIR):
+    """Como decodificar_capa, pero desde/hacia la cache. Devuelve (surface, AnalisisCapa)."""
+    if not CACHE_ACTIVA:
+        surf = decodificar_capa(ruta, tamano)
+        return surf, analizar_capa(surf)
+    nombre, clave = _nombre(ruta), _clave(ruta, "capa", tuple(tamano))
+    leido = _leer(directorio, nombre, clave)
+    if leido is not None:
+        indice, grupos = leido
+        opaca, visible = indice["analisis"]
+        return grupos["capa"][0], AnalisisCapa(opaca, tuple(visible) if visible else None)
+    surf = decodificar_capa(ruta, tamano)
+    analisis = analizar_capa(surf)
+    _guardar(directorio, nombre, clave, {"capa": [surf]}, {"analisis": list(analisis)})
+    return surf, analisis
+
+
+def _meta_a_json(m):
+    return [m.baseline, list(m.bbox), m.opacos]
+
+
+def _meta_desde_json(d):
+    return FrameMeta(d[0], pygame.Rect(d[1]), d[2])
+
+
+def sheet(ruta, alturas=(), frame_w=None, variante="", directorio=CACHE_DIR):
+    """
+    Como decodificar_sheet, pero desde/hacia la cache y con los frames ya escalados a
+    cada alto de `alturas`. Devuelve (frames, metas, {alto: frames escalados}).
+    variante separa entradas del mismo sheet con distintos altos (p. ej. "preview").
+    """
+    alturas = tuple(sorted(set(alturas)))
+    if not CACHE_ACTIVA:
+        frames, metas = decodificar_sheet(ruta, frame_w)
+        return frames, metas, {a: [escalar_frame(f, a) for f in frames] for a in alturas}
+    nombre = _nombre(ruta) + (f"@{variante}" if variante else "")
+    clave = _clave(ruta, "sheet", frame_w, alturas)
+    leido = _leer(directorio, nombre, clave)
+    if leido is not None:
+        indice, grupos = leido
+        metas = [_meta_desde_json(d) for d in indice["metas"]]
+        return grupos["frames"], metas, {a: grupos[f"alto_{a}"] for a in alturas}
+    frames, metas = decodificar_sheet(ruta, frame_w)
+    escalados = {a: [escalar_frame(f, a) for f in frames] for a in alturas}
+    superficies = {"frames": frames}
+    superficies.update((f"alto_{a}", lista) for a, lista in escalados.items())
+    _guardar(directorio, nombre, clave, superficies, {"metas": [_meta_a_json(m) for m in metas]})
+    return frames, metas, escalados
+
+
+def limpiar(directorio=CACHE_DIR):
+    """Borra todos los archivos de la cache; devuelve cuántos."""
+    if not os.path.isdir(directorio):
+        return 0
+    n = 0
+    for fname in os.listdir(directorio):
+        if fname.endswith((".rgba", ".json", ".tmp")):
+            os.remove(os.path.join(directorio, fname))
+            n += 1
+    return n
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m core.cache_assets",
+                                     description="Construye la cache de assets procesados")
+    parser.add_argument("--limpiar", action="store_true", help="borrar la cache antes de construirla")
+    parser.add_argument("--hilos", type=int, default=None, help="hilos de procesamiento")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import main as juego
+    if args.limpiar:
+        print(f"{limpiar()} archivo(s) borrados de {CACHE_DIR}")
+    tareas = juego.todas_las_tareas()
+    t0 = time.perf_counter()
+    resultados = cargar_en_paralelo(tareas, trabajadores=args.hilos)
+    dt = (time.perf_counter() - t0) * 1000.0
+    fallos = {clave: r for clave, r in resultados.items() if isinstance(r, Exception)}
+    for clave, e in fallos.items():
+        print(f"[WARN] {clave}: {e}")
+    print(f"{len(resultados) - len(fallos)}/{len(resultados)} assets en {CACHE_DIR} ({dt:.0f} ms)")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
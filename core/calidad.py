@@ -0,0 +1,158 @@
+# core/calidad.py
+"""
+Gobernador de calidad: baja la calidad del dibujado cuando los frames no entran en
+el presupuesto y la recupera cuando sobra tiempo.
+
+Cada frame se mide (inicio_frame / fin_frame, sin contar la espera de clock.tick) y se
+guarda en una ventana de VENTANA_FRAMES muestras. Si la media pasa de UMBRAL_BAJAR del
+presupuesto se baja un nivel de NIVELES_CALIDAD; si se mantiene por debajo de
+UMBRAL_SUBIR durante FRAMES_HOLGURA frames se sube uno. Tras cada cambio se espera una
+ventana completa de muestras del nivel nuevo antes de volver a decidir, y si un nivel
+recién recuperado vuelve a no entrar, la espera para recuperarlo se duplica (así no
+oscila entre dos niveles).
+
+Lo que cambia cada nivel (ver Calidad):
+    escala_fondo: escala de la superficie interna donde se compone el parallax, que luego
+        se amplía a la ventana (el fondo son varias capas del tamaño de la pantalla: es
+        lo que más píxeles mueve). 0.5 es exacto en pygame.transform.scale; escalas no
+        enteras cuestan más al ampliar de lo que ahorran.
+    sombra: la sombra del jugador.
+    destellos: el overlay de pantalla completa de los destellos (el texto se dibuja igual).
+    capas_lentas: las capas del parallax con transparencia y factor < FACTOR_CAPA_LENTA.
+
+stats() devuelve el estado y las últimas decisiones (para el HUD del perfil y el bench).
+"""
+import time
+from collections import deque, namedtuple
+
+from core.perfil import PRESUPUESTO_MS
+
+Calidad = namedtuple("Calidad", ["nombre", "escala_fondo", "sombra", "destellos", "capas_lentas"])
+
+# de más a menos calidad
+NIVELES_CALIDAD = (
+    Calidad("alta", 1.0, True, True, True),
+    Calidad("sin_sombra", 1.0, False, True, True),
+    Calidad("media", 0.5, False, True, True),
+    Calidad("baja", 0.5, False, False, True),
+    Calidad("minima", 0.5, False, False, False),
+)
+CALIDAD_MAXIMA = NIVELES_CALIDAD[0]
+
+# capas del parallax que se dejan de dibujar en los niveles sin capas_lentas
+FACTOR_CAPA_LENTA = 0.5
+
+VENTANA_FRAMES = 30
+UMBRAL_BAJAR = 0.9
+UMBRAL_SUBIR = 0.6
+FRAMES_HOLGURA = 90
+FRAMES_HOLGURA_MAX = 90 * 16
+HISTORIAL_DECISIONES = 32
+
+Decision = namedtuple("Decision", ["frame", "de", "a", "media_ms", "motivo"])
+
+
+class GobernadorCalidad:
+    def __init__(self, presupuesto_ms=PRESUPUESTO_MS, niveles=NIVELES_CALIDAD, ventana=VENTANA_FRAMES,
+                 activo=True):
+        self.presupuesto_ms = presupuesto_ms
+        self.niveles = tuple(niveles)
+        self.activo = activo
+        self.nivel = 0
+        self.frames = 0
+        self.cambios = 0
+        self.decisiones = deque(maxlen=HISTORIAL_DECISIONES)
+        self._muestras = deque(maxlen=ventana)
+        self._suma = 0.0
+        self._ultimo_cambio = 0
+        self._holgura = 0
+        # nivel -> frames de holgura necesarios para volver a subir a él
+        self._espera = {}
+        self._t0 = None
+
+    @property
+    def calidad(self):
+        return self.niveles[self.nivel]
+
+    @property
+    def media_ms(self):
+        return self._suma / len(self._muestras) if self._muestras else 0.0
+
+    def espera_para_subir(self, nivel):
+        """Frames de holgura necesarios para volver a subir a `nivel`."""
+        return self._espera.get(nivel, FRAMES_HOLGURA)
+
+    def activar(self, activo):
+        """Apagado, se dibuja siempre con la calidad máxima."""
+        self.activo = activo
+        if not activo and self.nivel != 0:
+            self._cambiar(0, "apagado")
+        self._muestras.clear()
+        self._suma = 0.0
+        self._holgura = 0
+
+    def alternar(self):
+        self.activar(not self.activo)
+
+    def inicio_frame(self):
+        self._t0 = time.perf_counter()
+
+    def fin_frame(self):
+        if self._t0 is not None:
+            self.registrar((time.perf_counter() - self._t0) * 1000.0)
+            self._t0 = None
+
+    def registrar(self, ms):
+        """Añade la duración de un frame y decide si cambiar de nivel."""
+        if not self.activo:
+            return
+        muestras = self._muestras
+        if len(muestras) == muestras.maxlen:
+            self._suma -= muestras[0]
+        muestras.append(ms)
+        self._suma += ms
+        self.frames += 1
+        # una ventana completa medida con el nivel actual antes de decidir
+        if len(muestras) < muestras.maxlen or self.frames - self._ultimo_cambio < muestras.maxlen:
+            return
+        media = self.media_ms
+        if media > self.presupuesto_ms * UMBRAL_BAJAR:
+            self._holgura = 0
+            if self.nivel < len(self.niveles) - 1:
+                ultima = self.decisiones[-1] if self.decisiones else None
+                if ultima is not None and ultima.motivo == "holgura" and ultima.a == self.calidad.nombre:
+                    # el nivel recién recuperado no entra: cuesta más volver a intentarlo
+                    espera = self.espera_para_subir(self.nivel)
+                    self._espera[self.nivel] = min(FRAMES_HOLGURA_MAX, espera * 2)
+                self._cambiar(self.nivel + 1, "lento")
+        elif media < self.presupuesto_ms * UMBRAL_SUBIR and self.nivel > 0:
+            self._holgura += 1
+            if self._holgura >= self.espera_para_subir(self.nivel - 1):
+                self._cambiar(self.nivel - 1, "holgura")
+        else:
+            self._holgura = 0
+
+    def _cambiar(self, nivel, motivo):
+        self.decisiones.append(Decision(self.frames, self.niveles[self.nivel].nombre,
+                                        self.niveles[nivel].nombre, round(self.media_ms, 2), motivo))
+        self.nivel = nivel
+        self.cambios += 1
+        self._ultimo_cambio = self.frames
+        self._holgura = 0
+
+    def stats(self):
+        calidad = self.calidad
+        return {
+            "activo": self.activo,
+            "nivel": self.nivel,
+            "calidad": calidad.nombre,
+            "escala_fondo": calidad.escala_fondo,
+            "sombra": calidad.sombra,
+            "destellos": calidad.destellos,
+            "capas_lentas": calidad.capas_lentas,
+            "media_ms": round(self.media_ms, 2),
+            "presupuesto_ms": round(self.presupuesto_ms, 2),
+            "frames": self.frames,
+            "cambios": self.cambios,
+            "decisiones": [d._asdict() for d in self.decisiones],
+        }
@@ -0,0 +1,112 @@
+# core/efectos.py
+"""
+Destellos de pantalla completa ("Nivel abajo", "¡Nivel arriba!", "¡Desvalijado!")
+y overlays oscuros, sin crear una superficie SRCALPHA nueva en cada frame.
+
+Cada overlay es una superficie opaca de un solo color que se construye una vez por
+(color, resolución) y se mezcla con alpha de superficie (set_alpha). Si hay varios
+efectos a la vez del mismo color se combinan en un solo blit; si no, un blit por efecto.
+"""
+from collections import OrderedDict, namedtuple
+
+import pygame
+from core.utils import dibujar_texto
+
+# color, alpha máximo (0-255), duración total, fundidos y texto de cada efecto
+Efecto = namedtuple("Efecto", ["color", "alpha", "duracion_ms", "fade_in_ms", "fade_out_ms",
+                               "texto", "color_texto", "pos_texto"])
+
+# pos_texto es relativa al centro de la pantalla
+EFECTOS = {
+    "reduccion": Efecto((0, 255, 0), 50, 1000, 80, 250, "Nivel abajo", (0, 255, 0), (-80, -30)),
+    "subida": Efecto((255, 0, 0), 60, 1000, 80, 250, "¡Nivel arriba!", (255, 80, 80), (-90, -30)),
+    "desvalijado": Efecto((255, 0, 0), 80, 1000, 80, 250, "¡Desvalijado!", (255, 120, 120), (-100, -10)),
+}
+
+# máximo de overlays de color distintos guardados
+OVERLAY_CACHE_MAX = 16
+
+
+class CapaEfectos:
+    def __init__(self, efectos=EFECTOS, max_entries=OVERLAY_CACHE_MAX):
+        self.efectos = efectos
+        self.max_entries = max_entries
+        self._overlays = OrderedDict()
+
+    def overlay(self, color, alpha, tamano):
+        """Superficie de `tamano` rellena de `color` con alpha de superficie `alpha` (cacheada)."""
+        key = (tuple(color), tuple(tamano))
+        surf = self._overlays.get(key)
+        if surf is None:
+            surf = pygame.Surface(tamano)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            surf.fill(color)
+            self._overlays[key] = surf
+            if len(self._overlays) > self.max_entries:
+                self._overlays.popitem(last=False)
+        else:
+            self._overlays.move_to_end(key)
+        surf.set_alpha(alpha)
+        return surf
+
+    def intensidad(self, nombre, fin_ms, ahora):
+        """Alpha actual (0-255) del efecto que termina en fin_ms, con sus fundidos."""
+        ef = self.efectos[nombre]
+        restante = fin_ms - ahora
+        if restante <= 0:
+            return 0
+        transcurrido = ef.duracion_ms - restante
+        f = 1.0
+        if ef.fade_in_ms > 0 and transcurrido < ef.fade_in_ms:
+            f = max(0.0, transcurrido / ef.fade_in_ms)
+        if ef.fade_out_ms > 0 and restante < ef.fade_out_ms:
+            f = min(f, restante / ef.fade_out_ms)
+        return int(ef.alpha * f)
+
+    def componer(self, ventana, capas):
+        """
+        Dibuja capas [(color, alpha)] una encima de otra con los overlays cacheados. Si
+        todas tienen el mismo color se mezclan en un solo blit (alpha 1 - prod(1 - a)); con
+        colores distintos se hace un blit por capa, en orden: un color mezclado cambiaría
+        en cada frame del fundido y crearía un overlay nuevo por frame.
+        """
+        capas = [(tuple(color), alpha) for color, alpha in capas if alpha > 0]
+        if not capas:
+            return
+        tamano = ventana.get_size()
+        color = capas[0][0]
+        if all(c == color for c, _ in capas):
+            transmision = 1.0
+            for _, alpha in capas:
+                transmision *= 1.0 - alpha / 255.0
+            ventana.blit(self.overlay(color, int(round((1.0 - transmision) * 255)), tamano), (0, 0))
+            return
+        for color, alpha in capas:
+            ventana.blit(self.overlay(color, alpha, tamano), (0, 0))
+
+    def dibujar(self, ventana, activos, ahora, fuente, overlay=True):
+        """
+        activos: [(nombre_efecto, fin_ms)] en orden de dibujado; ahora: tiempo actual en ms.
+        overlay: False para dibujar solo los textos, sin el destello de pantalla completa.
+        """
+        capas = []
+        textos = []
+        for nombre, fin_ms in activos:
+            alpha = self.intensidad(nombre, fin_ms, ahora)
+            if alpha <= 0:
+                continue
+            ef = self.efectos[nombre]
+            capas.append((ef.color, alpha))
+            textos.append(ef)
+        if not capas:
+            return
+        if overlay:
+            self.componer(ventana, capas)
+        cx, cy = ventana.get_width() // 2, ventana.get_height() // 2
+        for ef in textos:
+            if ef.texto:
+                dibujar_texto(ventana, ef.texto, fuente, ef.color_texto, (cx + ef.pos_texto[0], cy + ef.pos_texto[1]))
+
+
+CAPA_EFECTOS = CapaEfectos()
@@ -0,0 +1,88 @@
+# core/entidades.py
+"""
+Contenedor de obstáculos/ítems ordenado por x.
+
+Todo se desplaza hacia la izquierda a la misma velocidad, así que el orden por x
+no cambia después de insertar: los que salen de pantalla siempre están al frente
+(se retiran con popleft en O(1)) y los que pueden tocar al jugador son un tramo
+contiguo que se recorre desde el frente hasta pasar su borde derecho.
+
+liberar(entidad), si se da, se llama con cada entidad que sale del contenedor
+(por ejemplo Pool.liberar para reutilizarla). colision es el atributo con la caja
+de colisión de cada entidad ("rect" o "hitbox").
+"""
+from collections import deque
+
+
+class EntityStore:
+    def __init__(self, entidades=(), liberar=None, colision="rect"):
+        self._d = deque()
+        self._liberar = liberar
+        self._colision = colision
+        for e in entidades:
+            self.append(e)
+
+    def append(self, entidad):
+        """Inserta manteniendo el orden por rect.x (casi siempre va al final)."""
+        d = self._d
+        x = entidad.rect.x
+        if not d or d[-1].rect.x <= x:
+            d.append(entidad)
+            return
+        i = len(d) - 1
+        while i > 0 and d[i - 1].rect.x > x:
+            i -= 1
+        d.insert(i, entidad)
+
+    def mover(self, velocidad):
+        for e in self._d:
+            e.mover(velocidad)
+
+    def retirar_fuera(self, limite=0):
+        """Quita del frente los que ya salieron por la izquierda (rect.right < limite)."""
+        d = self._d
+        liberar = self._liberar
+        retirados = 0
+        while d and d[0].rect.right < limite:
+            e = d.popleft()
+            if liberar:
+                liberar(e)
+            retirados += 1
+        return retirados
+
+    def candidatos(self, x0, x1):
+        """Entidades cuyo tramo [left, right] se solapa con [x0, x1], en orden de x."""
+        for e in self._d:
+            r = e.rect
+            if r.left > x1:
+                break
+            if r.right >= x0:
+                yield e
+
+    def colisiones(self, rect):
+        """Lista (en orden de x) de las entidades cuya caja de colisión toca rect."""
+        attr = self._colision
+        return [e for e in self.candidatos(rect.left, rect.right) if rect.colliderect(getattr(e, attr))]
+
+    def quitar(self, entidad):
+        self._d.remove(entidad)
+        if self._liberar:
+            self._liberar(entidad)
+
+    def clear(self):
+        if self._liberar:
+            for e in self._d:
+                self._liberar(e)
+        self._d.clear()
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __len__(self):
+        return len(self._d)
+
+    def __bool__(self):
+        return bool(self._d)
+
+    def __getitem__(self, i):
+        return self._d[i]
@@ -0,0 +1,283 @@
+# core/entorno.py
+"""
+Entorno estilo Gym sobre GameSimulation, para entrenar y evaluar agentes con las
+reglas reales del juego.
+
+    entorno = Entorno(semilla=0, frame_skip=4)
+    obs, info = entorno.reset()
+    while True:
+        obs, recompensa, terminado, truncado, info = entorno.step(accion)
+        if terminado or truncado:
+            break
+
+Las acciones son los bits de la entrada (BIT_SALTAR / BIT_AGACHAR): 0 nada, 1 saltar,
+2 agacharse, 3 las dos (también se acepta una Entrada). Con frame_skip=k cada step
+repite la acción k ticks (o hasta que la partida termine) y la recompensa es la suma:
+RECOMPENSA_TICK por tick sobrevivido (el tick en que muere no cuenta).
+
+Observaciones:
+    "vector": array float32 con CARACTERISTICAS (los n obstáculos más cercanos delante
+        del jugador, su estado y los poderes activos), normalizado con las escalas de abajo.
+    "pixeles": el frame dibujado con main.dibujar_juego, como vista sin copia
+        (pygame.surfarray.pixels3d, forma (ancho, alto, 3)) de la superficie de salida.
+        Es siempre el mismo array y cada step lo sobrescribe: np.array(obs) para guardarlo.
+        El frame se dibuja en otra superficie y se escala a la de salida (a tamano_pixeles
+        o a su mismo tamaño): la vista bloquea la superficie de salida, y sobre una
+        superficie bloqueada no se puede hacer blit pero sí transform.scale.
+    "ambas": {"vector": ..., "pixeles": ...}.
+
+Sin píxeles ni ventana no se dibuja nada, y nunca se llama a clock.tick (salvo con
+fps): el step va tan rápido como la simulación.
+
+    python -m core.entorno [--bot reactivo] [--pasos 20000] [--frame-skip 1]
+                           [--observacion vector|pixeles|ambas] [--tamano-pixeles 160x111] [--ventana]
+                           [--calidad minima]
+"""
+import os
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional fuera del entorno
+    np = None
+
+import pygame
+
+from settings import ANCHO, ALTO, ALTURA_SUELO
+from core.simulacion import GameSimulation, Entrada, bits_a_entrada
+from core.player import VELOCIDAD_MAX_CAIDA
+from core.poderes import DURACION_INVULNERABLE_MS, CUENTA_STACK
+from core.bots import proximos_obstaculos
+
+ACCIONES = ("nada", "saltar", "agachar", "saltar+agachar")
+OBSERVACIONES = ("vector", "pixeles", "ambas")
+RECOMPENSA_TICK = 1.0
+N_OBSTACULOS = 3
+
+# escalas de normalización: posiciones por el tamaño de la pantalla, velocidades por la de caída máxima
+ESCALA_NIVEL = 10.0
+ESCALA_STACK = 5.0
+
+_CAMPOS_OBSTACULO = ("distancia", "arriba", "abajo", "ancho", "techo")
+_CAMPOS_ESTADO = ("jugador_altura", "jugador_vy", "en_suelo", "agachado", "velocidad", "nivel",
+                  "escudo", "invulnerable", "invulnerable_restante", "revelando", "stack", "contador_stack")
+
+
+def caracteristicas(n_obstaculos=N_OBSTACULOS):
+    """Nombres de las componentes del vector de observación, en orden."""
+    return tuple(f"obs{i}_{campo}" for i in range(n_obstaculos) for campo in _CAMPOS_OBSTACULO) + _CAMPOS_ESTADO
+
+
+CARACTERISTICAS = caracteristicas()
+
+
+def vector_observacion(sim, n_obstaculos=N_OBSTACULOS):
+    """
+    Lista con las CARACTERISTICAS de sim. Por obstáculo: distancia (del borde derecho del
+    jugador a la hitbox, / ANCHO), arriba y abajo de la hitbox (px sobre el suelo, / ALTO),
+    ancho (/ ANCHO) y 1 si es de techo. Los que faltan quedan a distancia 1 y el resto en 0.
+    """
+    suelo = ALTO - ALTURA_SUELO
+    valores = []
+    delante = proximos_obstaculos(sim, n_obstaculos)
+    for distancia, o in delante:
+        hitbox = o.hitbox
+        valores += (distancia / ANCHO, (suelo - hitbox.top) / ALTO, (suelo - hitbox.bottom) / ALTO,
+                    hitbox.width / ANCHO, 1.0 if o.tipo == "techo" else 0.0)
+    for _ in range(n_obstaculos - len(delante)):
+        valores += (1.0, 0.0, 0.0, 0.0, 0.0)
+    jugador = sim.jugador
+    estado = sim.estado
+    restante = max(0.0, estado.tiempo_invulnerable - sim.ahora) if estado.invulnerable else 0.0
+    valores += ((suelo - jugador.rect.bottom) / ALTO, jugador.velocidad_y / VELOCIDAD_MAX_CAIDA,
+                float(jugador.en_suelo), float(jugador.agachado), estado.velocidad / VELOCIDAD_MAX_CAIDA,
+                estado.nivel / ESCALA_NIVEL, float(estado.escudo), float(estado.invulnerable),
+                restante / DURACION_INVULNERABLE_MS, float(estado.revelando), len(estado.stack) / ESCALA_STACK,
+                estado.contador_stack / CUENTA_STACK)
+    return valores
+
+
+class Entorno:
+    """
+    semilla: la de la primera partida (None = al azar); reset(semilla) la cambia.
+    frame_skip: ticks que avanza cada step con la misma acción.
+    observacion: "vector", "pixeles" o "ambas".
+    tamano_pixeles: (ancho, alto) al que reducir el frame (None = ANCHO x ALTO).
+    ventana: además muestra cada step en la ventana del juego (sin limitar los FPS salvo con fps).
+    personaje: el del roster de main (sprites al dibujar; sin dibujar solo se usa su alto).
+    max_ticks: a partir de ahí el step devuelve truncado=True.
+    calidad: nombre de un nivel de core.calidad con el que dibujar (p. ej. "minima": menos de la
+        mitad de coste por frame; por defecto la máxima).
+    """
+
+    def __init__(self, semilla=None, frame_skip=1, observacion="vector", tamano_pixeles=None, ventana=False,
+                 personaje=None, alto_jugador=None, n_obstaculos=N_OBSTACULOS, max_ticks=None, backend="objetos",
+                 fps=None, calidad=None):
+        if np is None:
+            raise RuntimeError("el entorno requiere numpy (pip install numpy)")
+        if observacion not in OBSERVACIONES:
+            raise ValueError(f"observación desconocida: {observacion!r} (disponibles: {', '.join(OBSERVACIONES)})")
+        if frame_skip < 1:
+            raise ValueError("frame_skip tiene que ser >= 1")
+        self.frame_skip = frame_skip
+        self.observacion = observacion
+        self.n_obstaculos = n_obstaculos
+        self.max_ticks = max_ticks
+        self.ventana = ventana
+        self.fps = fps
+        self.dibuja = ventana or observacion != "vector"
+        self.dimension = len(caracteristicas(n_obstaculos))
+        self.calidad = _calidad(calidad)
+
+        sprite, escala = None, 1.8
+        self._main = None
+        self._salida = self._pixeles = None
+        if self.dibuja:
+            if not ventana and not pygame.display.get_init():
+                os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            import main
+            from core.utils import obtener_fuente
+            self._main = main
+            if ventana:
+                self._superficie = pygame.display.set_mode((ANCHO, ALTO))
+            else:
+                # hace falta un modo de vídeo para que los assets se conviertan al formato de la pantalla
+                # (sin convertir, cada blit es varias veces más lento)
+                if pygame.display.get_surface() is None:
+                    pygame.display.set_mode((1, 1))
+                self._superficie = pygame.Surface((ANCHO, ALTO)).convert()
+            if observacion != "vector":
+                self._salida = pygame.Surface(tamano_pixeles or (ANCHO, ALTO)).convert()
+                self._pixeles = pygame.surfarray.pixels3d(self._salida)
+            self._fondo = main.cargar_background()
+            self._fuente = obtener_fuente(None, 30)
+            self._reloj = pygame.time.Clock()
+            if personaje is not None:
+                sprite = main.PERSONAJES.animaciones(personaje)
+                escala = main.SCALE_BY_CHAR.get(personaje, 1.8)
+        elif personaje is not None and alto_jugador is None:
+            # sin dibujar no hacen falta los sprites: solo la altura con la que juega el personaje
+            import main
+            alturas = main.PERSONAJES.alturas(personaje)
+            alto_jugador = alturas[0] if alturas else None
+        self.sim = GameSimulation(sprite=sprite or None, escala=escala, semilla=semilla, alto_jugador=alto_jugador,
+                                  backend=backend)
+        self._siguiente_semilla = self.sim.semilla
+
+    # --- API ---
+
+    def reset(self, semilla=None):
+        """Empieza una partida (con `semilla` o la siguiente a la anterior); devuelve (obs, info)."""
+        if semilla is None:
+            semilla = self._siguiente_semilla
+        self._siguiente_semilla = semilla + 1
+        self.sim.reiniciar(semilla=semilla)
+        return self._observar(0), self._info()
+
+    def step(self, accion):
+        """Devuelve (obs, recompensa, terminado, truncado, info)."""
+        entrada = accion if isinstance(accion, Entrada) else bits_a_entrada(int(accion))
+        sim = self.sim
+        recompensa = 0.0
+        ticks = 0
+        terminado = False
+        for _ in range(self.frame_skip):
+            terminado = sim.step(entrada)
+            ticks += 1
+            if terminado:
+                break
+            recompensa += RECOMPENSA_TICK
+        truncado = not terminado and self.max_ticks is not None and sim.frame_count >= self.max_ticks
+        return self._observar(ticks), recompensa, terminado, truncado, self._info()
+
+    def cerrar(self):
+        # suelta la vista de los píxeles (desbloquea la superficie de salida)
+        self._pixeles = None
+        self.sim.obstaculos.clear()
+        self.sim.items.clear()
+
+    # --- observación ---
+
+    def _info(self):
+        sim = self.sim
+        return {"semilla": sim.semilla, "ticks": sim.frame_count, "segundos": sim.segundos_supervivencia,
+                "nivel": sim.estado.nivel, "causa": sim.causa_muerte}
+
+    def _observar(self, ticks):
+        pixeles = self._dibujar(ticks) if self.dibuja else None
+        if self.observacion == "pixeles":
+            return pixeles
+        vector = np.array(vector_observacion(self.sim, self.n_obstaculos), dtype=np.float32)
+        if self.observacion == "ambas":
+            return {"vector": vector, "pixeles": pixeles}
+        return vector
+
+    def _dibujar(self, ticks):
+        self._main.dibujar_juego(self._superficie, self.sim, self._fondo, self._fuente, 0, 1, dt=max(1, ticks),
+                                 calidad=self.calidad)
+        if self.ventana:
+            pygame.event.pump()
+            pygame.display.flip()
+            if self.fps:
+                self._reloj.tick(self.fps)
+        if self._salida is None:
+            return None
+        pygame.transform.scale(self._superficie, self._salida.get_size(), self._salida)
+        return self._pixeles
+
+
+def _calidad(nombre):
+    from core.calidad import NIVELES_CALIDAD, CALIDAD_MAXIMA
+    if nombre is None:
+        return CALIDAD_MAXIMA
+    for calidad in NIVELES_CALIDAD:
+        if calidad.nombre == nombre:
+            return calidad
+    raise ValueError(f"calidad desconocida: {nombre!r} (disponibles: {', '.join(c.nombre for c in NIVELES_CALIDAD)})")
+
+
+def _tamano(texto):
+    ancho, alto = texto.lower().split("x")
+    return int(ancho), int(alto)
+
+
+def main(argv=None):
+    import argparse
+    import random
+    from core.bots import BOTS, crear_bot
+    parser = argparse.ArgumentParser(prog="python -m core.entorno",
+                                     description="Juega partidas con un bot a través del entorno y mide steps/s")
+    parser.add_argument("--bot", default="reactivo", help=f"política ({', '.join(BOTS)} o modulo:Clase)")
+    parser.add_argument("--pasos", type=int, default=20000, help="steps del entorno a dar")
+    parser.add_argument("--frame-skip", type=int, default=1)
+    parser.add_argument("--observacion", default="vector", choices=OBSERVACIONES)
+    parser.add_argument("--tamano-pixeles", type=_tamano, default=None, metavar="ANCHOxALTO")
+    parser.add_argument("--ventana", action="store_true", help="muestra las partidas (sin limitar los FPS)")
+    parser.add_argument("--calidad", default=None, help="nivel de calidad al dibujar (alta ... minima)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    entorno = Entorno(args.semilla, args.frame_skip, args.observacion, args.tamano_pixeles, args.ventana,
+                      calidad=args.calidad)
+    bot = crear_bot(args.bot, random.Random(args.semilla ^ 0x5EED))
+    entorno.reset()
+    partidas, ticks, recompensas = 0, 0, 0.0
+    t0 = time.perf_counter()
+    for _ in range(args.pasos):
+        # el bot decide sobre la simulación; un agente usaría la observación
+        _, recompensa, terminado, truncado, info = entorno.step(bot.decidir(entorno.sim))
+        recompensas += recompensa
+        if terminado or truncado:
+            partidas += 1
+            ticks += info["ticks"]
+            entorno.reset()
+    dt = time.perf_counter() - t0
+    entorno.cerrar()
+    print(f"[INFO] {args.pasos} steps en {dt:.2f} s ({args.pasos / dt:.0f} steps/s, frame_skip {args.frame_skip}), "
+          f"{partidas} partidas terminadas, recompensa media {recompensas / max(1, partidas):.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# core/fondo.py
+"""
+Parallax de fondo con las capas ya preparadas para dibujar rápido.
+
+- Las capas totalmente opacas se guardan con convert() (blit sin alpha).
+- Las capas con transparencia se recortan verticalmente a las filas que tienen
+  algún píxel visible (menos área que mezclar por frame).
+- Cada capa se pre-repite horizontalmente hasta cubrir al menos el ancho de la
+  pantalla, así que un frame necesita como mucho dos blits por capa.
+- Opcionalmente se aplanan en una sola superficie las capas que se mueven juntas
+  (factores de parallax iguales o dentro de `tolerancia_aplanado`).
+"""
+from collections import namedtuple
+
+import pygame
+
+# lo que el compositor necesita saber de una capa antes de prepararla:
+#   opaca: ningún píxel con alpha < 255
+#   visible: (top, alto) de las filas con algún píxel visible (None = capa vacía)
+AnalisisCapa = namedtuple("AnalisisCapa", ["opaca", "visible"])
+
+
+class _Capa:
+    __slots__ = ("surf", "ancho", "y", "factor", "offset", "opaca")
+
+    def __init__(self, surf, y, factor, opaca):
+        self.surf = surf
+        self.ancho = surf.get_width()
+        self.y = y
+        self.factor = factor
+        self.offset = 0.0
+        self.opaca = opaca
+
+
+def _es_opaca(surf):
+    w, h = surf.get_size()
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return True
+    return pygame.mask.from_surface(surf, 254).count() == w * h
+
+
+def analizar_capa(surf):
+    """AnalisisCapa de surf (no depende de la ventana: se puede hacer al cargar o guardar en cache)."""
+    if _es_opaca(surf):
+        return AnalisisCapa(True, (0, surf.get_height()))
+    filas = pygame.mask.from_surface(surf, 0).get_bounding_rects()
+    if not filas:
+        return AnalisisCapa(False, None)
+    visible = filas[0].unionall(filas[1:])
+    return AnalisisCapa(False, (visible.top, visible.height))
+
+
+def _repetir(surf, ancho_min):
+    """Repite surf horizontalmente hasta tener al menos ancho_min de ancho."""
+    w, h = surf.get_size()
+    copias = max(1, -(-ancho_min // w))
+    if copias == 1:
+        return surf
+    tira = pygame.Surface((w * copias, h), surf.get_flags() & pygame.SRCALPHA)
+    for i in range(copias):
+        tira.blit(surf, (i * w, 0))
+    return tira
+
+
+class ParallaxCompositor:
+    """
+    capas: lista de (surface_escalada, factor) del fondo hacia el frente (None = capa ausente);
+    cada entrada puede traer un tercer elemento con su AnalisisCapa ya calculado.
+    tamano: (ancho, alto) de la pantalla.
+    """
+
+    def __init__(self, capas, tamano, tolerancia_aplanado=0.0):
+        self.tamano = tuple(tamano)
+        self.capas = []
+        # escala -> (superficie interna, capas reducidas), ver dibujar(escala=...)
+        self._escalas = {}
+        hay_display = pygame.display.get_surface() is not None
+        ancho, alto = self.tamano
+        pendientes = [(c[0], c[1], c[2] if len(c) > 2 else None) for c in capas if c[0] is not None]
+        for surf, factor, analisis in self._aplanar(pendientes, tolerancia_aplanado):
+            w, h = surf.get_size()
+            # alineamos la base de la imagen con el fondo si es más baja que la pantalla
+            y = 0 if h >= alto else alto - h
+            if analisis is None:
+                analisis = analizar_capa(surf)
+            opaca = analisis.opaca
+            if opaca:
+                surf = surf.convert() if hay_display else surf.copy()
+            else:
+                if analisis.visible is None:
+                    continue  # capa completamente transparente
+                top, alto_visible = analisis.visible
+                surf = surf.subsurface(pygame.Rect(0, top, w, alto_visible)).copy()
+                y += top
+                if hay_display:
+                    surf = surf.convert_alpha()
+            self.capas.append(_Capa(_repetir(surf, ancho), y, factor, opaca))
+        # si la capa del fondo es opaca y cubre toda la pantalla no hace falta limpiar antes
+        primera = self.capas[0] if self.capas else None
+        self.cubre_pantalla = bool(primera and primera.opaca and primera.y <= 0
+                                   and primera.surf.get_height() + primera.y >= alto)
+
+    @staticmethod
+    def _aplanar(capas, tolerancia):
+        """Combina capas consecutivas del mismo ancho cuyo factor difiere <= tolerancia."""
+        grupos = []
+        for surf, factor, analisis in capas:
+            if grupos:
+                base, f0, _ = grupos[-1]
+                if abs(factor - f0) <= tolerancia and base.get_size() == surf.get_size():
+                    plano = base.copy()
+                    plano.blit(surf, (0, 0))
+                    # la capa combinada se analiza de nuevo
+                    grupos[-1] = (plano, f0, None)
+                    continue
+            grupos.append((surf, factor, analisis))
+        return grupos
+
+    def dibujar(self, ventana, velocidad, dt, escala=1.0, factor_omitir=None, relleno=(0, 0, 0)):
+        """
+        Avanza las capas velocidad * factor * dt px y las dibuja (<= 2 blits por capa).
+        escala < 1: se componen en una superficie interna de tamano * escala (con las capas
+        reducidas una vez) que después se amplía a la ventana.
+        factor_omitir: no se dibujan las capas con transparencia de factor menor (siguen avanzando).
+        relleno: color de la superficie interna si las capas no la cubren.
+        """
+        for capa in self.capas:
+            capa.offset = (capa.offset + velocidad * capa.factor * dt) % capa.ancho
+        if escala >= 1.0:
+            self._componer(ventana, self.capas, 1.0, self.tamano[0], factor_omitir)
+            return
+        interna, capas = self._reducidas(escala)
+        if not self.cubre_pantalla:
+            interna.fill(relleno)
+        self._componer(interna, capas, escala, interna.get_width(), factor_omitir)
+        pygame.transform.scale(interna, ventana.get_size(), ventana)
+
+    def _componer(self, destino, capas, escala, ancho_destino, factor_omitir):
+        for capa, surf in zip(self.capas, capas):
+            if factor_omitir is not None and not capa.opaca and capa.factor < factor_omitir:
+                continue
+            if escala >= 1.0:
+                surf, y = capa.surf, capa.y
+            else:
+                surf, y = surf
+            ancho = surf.get_width()
+            x = -int(capa.offset * escala)
+            destino.blit(surf, (x, y))
+            if x + ancho < ancho_destino:
+                destino.blit(surf, (x + ancho, y))
+
+    def _reducidas(self, escala):
+        """(superficie interna, [(capa reducida, y)]) para `escala`, construidas la primera vez."""
+        cache = self._escalas.get(escala)
+        if cache is None:
+            ancho, alto = self.tamano
+            hay_display = pygame.display.get_surface() is not None
+            interna = pygame.Surface((max(1, int(ancho * escala)), max(1, int(alto * escala))))
+            if hay_display:
+                interna = interna.convert()
+            capas = []
+            for capa in self.capas:
+                w, h = capa.surf.get_size()
+                surf = pygame.transform.smoothscale(capa.surf, (max(1, int(w * escala)), max(1, int(h * escala))))
+                if hay_display:
+                    surf = surf.convert() if capa.opaca else surf.convert_alpha()
+                capas.append((surf, int(capa.y * escala)))
+            cache = self._escalas[escala] = (interna, capas)
+        return cache
+
+    def reiniciar(self):
+        for capa in self.capas:
+            capa.offset = 0.0
@@ -1,47 +1,62 @@
 import pygame
 import random
 import time
-from settings import ANCHO, ALTO, COLOR_ITEM, ALTURA_SUELO
+from settings import ANCHO, ALTO, COLOR_ITEM, ALTURA_SUELO, POOL_ITEMS_MAX
+from core.pool import Pool
+from core.poderes import TablaPesos
+
+# tipos de ítem y su probabilidad relativa de aparecer
+TIPOS_ITEM = TablaPesos(["escudo", "reduccion", "invulnerable", "misterioso"], [2, 2, 1, 3])
 
 class Item:
     """
     Ítem simple: rectángulo que se mueve hacia la izquierda.
     Tipos: escudo, reduccion, invulnerable, misterioso
+    rng: generador de aleatorios a usar (por defecto el módulo random global).
+
+    Se reutilizan desde POOL_ITEMS: reset() deja el objeto como recién creado.
     """
+    __slots__ = ("tipo", "rect", "prev_x", "velocidad", "anim_frame", "anim_tiempo")
+
+    def __init__(self, rng=random):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(rng)
 
-    def __init__(self):
-        tipos = random.choices(
-            ["escudo", "reduccion", "invulnerable", "misterioso"],
-            weights=[2, 2, 1, 3],
-            k=1
-        )
-        self.tipo = tipos[0]
+    def reset(self, rng=random):
+        self.tipo = TIPOS_ITEM.elegir(rng)
 
         # Posición: a la derecha de la pantalla, alineado verticalmente
         ancho_item = 30
-        x = ANCHO + random.randint(0, 200)
+        x = ANCHO + rng.randint(0, 200)
         # Centrar con respecto al jugador (suponiendo tamaño 95)
         centro_y = ALTO - ALTURA_SUELO - 95 // 2 - (ancho_item // 2)
         y = centro_y
 
-        self.rect = pygame.Rect(x, y, ancho_item, ancho_item)
+        self.rect.update(x, y, ancho_item, ancho_item)
+        # x antes del último movimiento (para interpolar al dibujar)
+        self.prev_x = x
         self.velocidad = 6
         self.anim_frame = 0
         self.anim_tiempo = time.time()
 
     def mover(self, velocidad_juego):
+        self.prev_x = self.rect.x
         self.rect.x -= int(velocidad_juego)
 
-    def dibujar(self, ventana):
+    def dibujar(self, ventana, alpha=1.0):
+        """alpha: fracción del tick actual (0 = posición anterior, 1 = posición actual)."""
+        rect = self.rect
+        if alpha < 1.0:
+            rect = rect.move(int((self.prev_x - rect.x) * (1.0 - alpha)), 0)
         color = self.obtener_color()
         if self.tipo == "misterioso":
             if time.time() - self.anim_tiempo > 0.12:
                 self.anim_frame = (self.anim_frame + 1) % 3
                 self.anim_tiempo = time.time()
             colores = [(255, 0, 255), (255, 255, 0), (0, 255, 255)]
-            pygame.draw.rect(ventana, colores[self.anim_frame], self.rect)
+            pygame.draw.rect(ventana, colores[self.anim_frame], rect)
         else:
-            pygame.draw.rect(ventana, color, self.rect)
+            pygame.draw.rect(ventana, color, rect)
 
     def obtener_color(self):
         colores = {
@@ -51,3 +66,6 @@ class Item:
             "misterioso": (255, 0, 255)
         }
         return colores.get(self.tipo, COLOR_ITEM)
+
+
+POOL_ITEMS = Pool(Item, POOL_ITEMS_MAX)
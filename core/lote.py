@@ -0,0 +1,262 @@
+# core/lote.py
+"""
+Partidas en lote, sin ventana, repartidas en un pool de procesos.
+
+Cada partida es una GameSimulation con su semilla (las reglas del juego tal cual: spawns,
+física de Player, poderes) controlada por un bot de core.bots. Las semillas se reparten
+en bloques; cada proceso juega un bloque y devuelve una fila por partida, y el resumen
+se va acumulando a medida que terminan los bloques (con --csv, las filas también se
+escriben según llegan).
+
+    python -m core.lote -n 10000 [--bot reactivo] [--procesos N] [--bloque 200] [--semilla 0]
+                        [--max-segundos 600] [--backend objetos|numpy] [--alto-jugador 95]
+                        [--intervalo-nivel 12000] [--multiplicador 1.25]
+                        [-o lotes/resumen.json] [--csv partidas.csv]
+
+--intervalo-nivel y --multiplicador cambian las constantes de dificultad solo en los
+procesos del lote (ver AJUSTABLES), para comparar resúmenes con distintos valores.
+"""
+import csv
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# constantes de dificultad que se pueden cambiar por lote: nombre -> (módulo, atributo)
+AJUSTABLES = {
+    "intervalo_nivel_ms": (("core.simulacion", "INTERVALO_NIVEL_MS"),),
+    "multiplicador_velocidad": (("core.simulacion", "MULTIPLICADOR_VELOCIDAD"),
+                                ("core.poderes", "MULTIPLICADOR_VELOCIDAD")),
+}
+
+BLOQUE = 200
+MAX_SEGUNDOS = 600
+# carpeta del resumen por defecto
+LOTE_DIR = "lotes"
+
+# una fila por partida; causa es "techo", "suelo" o "tiempo" (cortada en max_ticks)
+Partida = namedtuple("Partida", ["semilla", "ticks", "segundos", "nivel", "causa", "aplicados", "recogidos"])
+
+
+def aplicar_ajustes(ajustes):
+    """Cambia las constantes de AJUSTABLES; devuelve los valores anteriores (para restaurarlos)."""
+    anteriores = {}
+    for nombre, valor in (ajustes or {}).items():
+        if nombre not in AJUSTABLES:
+            raise ValueError(f"ajuste desconocido: {nombre!r} (disponibles: {', '.join(AJUSTABLES)})")
+        destinos = AJUSTABLES[nombre]
+        modulo, attr = destinos[0]
+        anteriores[nombre] = getattr(importlib.import_module(modulo), attr)
+        for modulo, attr in destinos:
+            setattr(importlib.import_module(modulo), attr, valor)
+    return anteriores
+
+
+def jugar_bloque(semillas, bot="reactivo", max_ticks=MAX_SEGUNDOS * 30, backend="objetos", alto_jugador=None):
+    """Juega una partida por semilla y devuelve [Partida]."""
+    from core.simulacion import GameSimulation
+    from core.bots import crear_bot
+    filas = []
+    sim = None
+    for semilla in semillas:
+        if sim is None:
+            sim = GameSimulation(semilla=semilla, alto_jugador=alto_jugador, backend=backend)
+        else:
+            sim.reiniciar(semilla=semilla)
+        # el bot tiene su propio rng: no consume el de la partida
+        jugador = crear_bot(bot, random.Random(semilla ^ 0x5EED))
+        step, decidir = sim.step, jugador.decidir
+        while not step(decidir(sim)) and sim.frame_count < max_ticks:
+            pass
+        filas.append(Partida(semilla, sim.frame_count, sim.segundos_supervivencia, sim.estado.nivel,
+                             sim.causa_muerte or "tiempo", dict(sim.poderes.aplicados),
+                             dict(sim.poderes.recogidos)))
+    if sim is not None:
+        sim.obstaculos.clear()
+        sim.items.clear()
+    return filas
+
+
+def _iniciar_proceso(ajustes):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    aplicar_ajustes(ajustes)
+
+
+def _percentil_histograma(histograma, total, p):
+    """Percentil p (0-100) de valores enteros dados como {valor: cuántas}."""
+    objetivo = (total - 1) * p / 100.0
+    visto = 0
+    for valor in sorted(histograma):
+        visto += histograma[valor]
+        if visto > objetivo:
+            return valor
+    return max(histograma) if histograma else 0
+
+
+class Resumen:
+    """Agregados de un lote; se alimenta partida a partida sin guardar las filas."""
+
+    def __init__(self):
+        self.partidas = 0
+        self.ticks = 0
+        self.segundos = Counter()
+        self.niveles = Counter()
+        self.causas = Counter()
+        self.aplicados = Counter()
+        self.recogidos = Counter()
+
+    def agregar(self, partida):
+        self.partidas += 1
+        self.ticks += partida.ticks
+        self.segundos[partida.segundos] += 1
+        self.niveles[partida.nivel] += 1
+        self.causas[partida.causa] += 1
+        self.aplicados.update(partida.aplicados)
+        self.recogidos.update(partida.recogidos)
+
+    @property
+    def segundos_simulados(self):
+        from core.simulacion import FPS
+        return self.ticks / FPS
+
+    def como_dict(self):
+        n = self.partidas or 1
+
+        def distribucion(histograma):
+            return {
+                "media": sum(v * c for v, c in histograma.items()) / n,
+                "p50": _percentil_histograma(histograma, n, 50),
+                "p90": _percentil_histograma(histograma, n, 90),
+                "p99": _percentil_histograma(histograma, n, 99),
+                "max": max(histograma) if histograma else 0,
+            }
+
+        def uso(contador):
+            return {k: {"total": v, "por_partida": v / n} for k, v in sorted(contador.items())}
+
+        return {
+            "partidas": self.partidas,
+            "segundos_simulados": self.segundos_simulados,
+            "supervivencia_s": distribucion(self.segundos),
+            "nivel": dict(distribucion(self.niveles), histograma={str(k): v for k, v in sorted(self.niveles.items())}),
+            "causas": dict(self.causas.most_common()),
+            "poderes": {"aplicados": uso(self.aplicados), "recogidos": uso(self.recogidos)},
+        }
+
+
+def _bloques(inicio, n, tam):
+    return [range(s, min(s + tam, inicio + n)) for s in range(inicio, inicio + n, max(1, tam))]
+
+
+def ejecutar(n, bot="reactivo", procesos=None, bloque=BLOQUE, semilla=0, max_ticks=MAX_SEGUNDOS * 30,
+             backend="objetos", alto_jugador=None, ajustes=None, al_terminar=None):
+    """
+    Juega las semillas semilla..semilla+n-1 y devuelve el Resumen.
+    procesos: tamaño del pool (None = os.cpu_count(); 1 = en este proceso, sin pool).
+    al_terminar(filas, resumen): se llama con cada bloque terminado, en orden de llegada.
+    """
+    resumen = Resumen()
+    bloques = _bloques(semilla, n, bloque)
+    args = (bot, max_ticks, backend, alto_jugador)
+    procesos = procesos or os.cpu_count() or 1
+
+    def recibir(filas):
+        for fila in filas:
+            resumen.agregar(fila)
+        if al_terminar:
+            al_terminar(filas, resumen)
+
+    if procesos == 1:
+        anteriores = aplicar_ajustes(ajustes)
+        try:
+            for semillas in bloques:
+                recibir(jugar_bloque(semillas, *args))
+        finally:
+            aplicar_ajustes(anteriores)
+        return resumen
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso, initargs=(ajustes,)) as pool:
+        pendientes = [pool.submit(jugar_bloque, semillas, *args) for semillas in bloques]
+        for futuro in as_completed(pendientes):
+            recibir(futuro.result())
+    return resumen
+
+
+def main(argv=None):
+    import argparse
+    from core.bots import BOTS
+    parser = argparse.ArgumentParser(prog="python -m core.lote", description="Partidas en lote sin ventana")
+    parser.add_argument("-n", type=int, default=1000, help="número de partidas")
+    parser.add_argument("--bot", default="reactivo",
+                        help=f"política de control ({', '.join(BOTS)} o modulo:Clase)")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (1 = sin pool)")
+    parser.add_argument("--bloque", type=int, default=BLOQUE, help="partidas por tarea del pool")
+    parser.add_argument("--semilla", type=int, default=0, help="primera semilla")
+    parser.add_argument("--max-segundos", type=int, default=MAX_SEGUNDOS, help="corta cada partida tras N s simulados")
+    parser.add_argument("--backend", default="objetos", choices=["objetos", "numpy"])
+    parser.add_argument("--alto-jugador", type=int, default=None, help="alto del jugador (por defecto 95 px)")
+    parser.add_argument("--intervalo-nivel", type=float, default=None, metavar="MS",
+                        help="ms entre subidas de nivel (INTERVALO_NIVEL_MS)")
+    parser.add_argument("--multiplicador", type=float, default=None,
+                        help="multiplicador de velocidad por nivel (MULTIPLICADOR_VELOCIDAD)")
+    parser.add_argument("-o", metavar="ARCHIVO", help=f"resumen en JSON (por defecto en {LOTE_DIR}/)")
+    parser.add_argument("--csv", metavar="ARCHIVO", help="una fila por partida, escrita según terminan los bloques")
+    args = parser.parse_args(argv)
+    if args.bot not in BOTS and ":" not in args.bot:
+        parser.error(f"bot desconocido: {args.bot!r} (disponibles: {', '.join(BOTS)})")
+
+    ajustes = {}
+    if args.intervalo_nivel is not None:
+        ajustes["intervalo_nivel_ms"] = args.intervalo_nivel
+    if args.multiplicador is not None:
+        ajustes["multiplicador_velocidad"] = args.multiplicador
+
+    from core.simulacion import FPS
+    salida_csv = open(args.csv, "w", newline="", encoding="utf-8") if args.csv else None
+    escritor = None
+    if salida_csv:
+        escritor = csv.writer(salida_csv)
+        escritor.writerow(["semilla", "ticks", "segundos", "nivel", "causa", "aplicados", "recogidos"])
+    t0 = time.perf_counter()
+
+    def al_terminar(filas, resumen):
+        if escritor:
+            for f in filas:
+                escritor.writerow([f.semilla, f.ticks, f.segundos, f.nivel, f.causa,
+                                   json.dumps(f.aplicados, sort_keys=True), json.dumps(f.recogidos, sort_keys=True)])
+            salida_csv.flush()
+        dt = time.perf_counter() - t0
+        print(f"[INFO] {resumen.partidas}/{args.n} partidas, {resumen.segundos_simulados:.0f} s simulados "
+              f"({resumen.ticks / dt:.0f} ticks/s)")
+
+    try:
+        resumen = ejecutar(args.n, args.bot, args.procesos, args.bloque, args.semilla, args.max_segundos * FPS,
+                           args.backend, args.alto_jugador, ajustes, al_terminar)
+    finally:
+        if salida_csv:
+            salida_csv.close()
+    dt = time.perf_counter() - t0
+    datos = resumen.como_dict()
+    datos["meta"] = {"fecha": time.strftime("%Y-%m-%dT%H:%M:%S"), "bot": args.bot,
+                     "semillas": [args.semilla, args.semilla + args.n - 1], "procesos": args.procesos or os.cpu_count(),
+                     "max_segundos": args.max_segundos, "backend": args.backend, "ajustes": ajustes,
+                     "duracion_s": dt, "ticks_por_s": resumen.ticks / dt if dt > 0 else 0.0}
+    salida = args.o or os.path.join(LOTE_DIR, time.strftime("resumen_%Y%m%d_%H%M%S.json"))
+    if os.path.dirname(salida):
+        os.makedirs(os.path.dirname(salida), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+    sup = datos["supervivencia_s"]
+    print(f"supervivencia media {sup['media']:.1f} s (p50 {sup['p50']}, p99 {sup['p99']}), "
+          f"nivel medio {datos['nivel']['media']:.1f}, causas {datos['causas']}")
+    print(f"resumen guardado en {salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
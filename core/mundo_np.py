@@ -0,0 +1,213 @@
+# core/mundo_np.py
+"""
+Contenedores de obstáculos/ítems como struct-of-arrays en NumPy (opcional).
+
+En vez de un objeto con su pygame.Rect por entidad, cada tabla guarda x, y, ancho,
+alto, x previa y tipo en arrays preasignados. Mover, retirar las que salieron de
+pantalla y probar colisiones contra el jugador son una operación vectorizada cada una.
+
+Tienen la misma interfaz que core.entidades.EntityStore (append, mover,
+retirar_fuera, colisiones, quitar, clear, iteración), así que generar_obstaculos /
+generar_items y GameSimulation(backend="numpy") los usan sin cambios: append copia
+el Obstaculo/Item recién generado a los arrays y lo devuelve a su pool. Al iterar se
+obtienen vistas ligeras (con rect, tipo y dibujar) para el renderer.
+"""
+import time
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él solo existe el backend de objetos
+    np = None
+
+from core.obstaculo import POOL_OBSTACULOS, OBSTACLE_TEXTURES
+from core.item import POOL_ITEMS, Item
+from settings import COLOR_OBSTACULO
+
+TIPOS_OBSTACULO = ("suelo", "techo", "otro")
+TIPOS_ITEM = ("escudo", "reduccion", "invulnerable", "misterioso")
+
+
+def disponible():
+    return np is not None
+
+
+class _Tabla:
+    """Arrays de una clase de entidad; `inset` es lo que la hitbox se encoge por lado."""
+
+    tipos = ()
+    inset = 0
+
+    def __init__(self, capacidad=64, liberar=None):
+        if np is None:
+            raise RuntimeError("el backend numpy requiere numpy (pip install numpy)")
+        self._liberar = liberar
+        self.n = 0
+        self._reservar(max(1, capacidad))
+
+    def _reservar(self, capacidad):
+        viejo = getattr(self, "x", None)
+        campos = {"x": np.int32, "y": np.int32, "w": np.int32, "h": np.int32,
+                  "prev_x": np.int32, "tipo": np.int8, "vivo": np.bool_}
+        for nombre, dtype in campos.items():
+            arr = np.zeros(capacidad, dtype=dtype)
+            if viejo is not None:
+                arr[:self.n] = getattr(self, nombre)[:self.n]
+            setattr(self, nombre, arr)
+        self.capacidad = capacidad
+
+    # --- interfaz de EntityStore ---
+
+    def append(self, entidad):
+        if self.n == self.capacidad:
+            self._reservar(self.capacidad * 2)
+        i = self.n
+        r = entidad.rect
+        self.x[i], self.y[i], self.w[i], self.h[i] = r.x, r.y, r.width, r.height
+        self.prev_x[i] = getattr(entidad, "prev_x", r.x)
+        self.tipo[i] = self.tipos.index(entidad.tipo) if entidad.tipo in self.tipos else len(self.tipos) - 1
+        self.vivo[i] = True
+        self.n += 1
+        # los datos ya están en los arrays: el objeto vuelve a su pool
+        if self._liberar:
+            self._liberar(entidad)
+
+    def mover(self, velocidad):
+        n = self.n
+        self.prev_x[:n] = self.x[:n]
+        self.x[:n] -= int(velocidad)
+
+    def retirar_fuera(self, limite=0):
+        """Compacta quitando las que salieron (x + w < limite) y las quitadas con quitar()."""
+        n = self.n
+        quedan = self.vivo[:n] & (self.x[:n] + self.w[:n] >= limite)
+        m = int(np.count_nonzero(quedan))
+        if m == n:
+            return 0
+        for nombre in ("x", "y", "w", "h", "prev_x", "tipo", "vivo"):
+            arr = getattr(self, nombre)
+            arr[:m] = arr[:n][quedan]
+        self.n = m
+        return n - m
+
+    def indices_colision(self, rect):
+        """Índices (en orden de x, estable) cuya caja de colisión toca rect, como Rect.colliderect."""
+        n = self.n
+        if n == 0 or rect.width <= 0 or rect.height <= 0:
+            return ()
+        k = self.inset
+        hx = self.x[:n] + k
+        hy = self.y[:n] + k
+        hw = self.w[:n] - 2 * k
+        hh = self.h[:n] - 2 * k
+        toca = (self.vivo[:n] & (hw > 0) & (hh > 0)
+                & (rect.x < hx + hw) & (rect.x + rect.width > hx)
+                & (rect.y < hy + hh) & (rect.y + rect.height > hy))
+        idx = np.flatnonzero(toca)
+        if len(idx) > 1:
+            idx = idx[np.argsort(self.x[idx], kind="stable")]
+        return idx
+
+    def colisiones(self, rect):
+        return [self._vista(int(i)) for i in self.indices_colision(rect)]
+
+    def quitar(self, vista):
+        self.vivo[vista.i] = False
+
+    def clear(self):
+        self.n = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.vivo[:self.n]))
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        # en orden de x, como EntityStore
+        n = self.n
+        orden = np.argsort(self.x[:n], kind="stable")
+        vivo = self.vivo
+        return (self._vista(int(i)) for i in orden if vivo[i])
+
+    def _vista(self, i):
+        raise NotImplementedError
+
+
+class _Vista:
+    """Lectura de la entidad i de una tabla con la forma de un Obstaculo/Item."""
+    __slots__ = ("tabla", "i")
+
+    def __init__(self, tabla, i):
+        self.tabla = tabla
+        self.i = i
+
+    @property
+    def rect(self):
+        t, i = self.tabla, self.i
+        return pygame.Rect(int(t.x[i]), int(t.y[i]), int(t.w[i]), int(t.h[i]))
+
+    @property
+    def prev_x(self):
+        return int(self.tabla.prev_x[self.i])
+
+    @property
+    def tipo(self):
+        return self.tabla.tipos[self.tabla.tipo[self.i]]
+
+    def _rect_interpolado(self, alpha):
+        rect = self.rect
+        if alpha < 1.0:
+            rect = rect.move(int((self.prev_x - rect.x) * (1.0 - alpha)), 0)
+        return rect
+
+
+class VistaObstaculo(_Vista):
+    __slots__ = ()
+
+    @property
+    def hitbox(self):
+        return self.rect.inflate(-8, -8)
+
+    def dibujar(self, ventana, alpha=1.0):
+        rect = self._rect_interpolado(alpha)
+        image = OBSTACLE_TEXTURES.get(rect.width, rect.height)
+        if image:
+            ventana.blit(image, rect.topleft, (0, 0, rect.width, rect.height))
+        else:
+            pygame.draw.rect(ventana, COLOR_OBSTACULO, rect)
+
+
+class VistaItem(_Vista):
+    __slots__ = ()
+
+    def dibujar(self, ventana, alpha=1.0):
+        rect = self._rect_interpolado(alpha)
+        if self.tipo == "misterioso":
+            # mismo parpadeo que Item.dibujar (cambia cada 0.12 s)
+            colores = [(255, 0, 255), (255, 255, 0), (0, 255, 255)]
+            pygame.draw.rect(ventana, colores[int(time.time() / 0.12) % 3], rect)
+        else:
+            pygame.draw.rect(ventana, Item.obtener_color(self), rect)
+
+
+class TablaObstaculos(_Tabla):
+    tipos = TIPOS_OBSTACULO
+    inset = 4  # hitbox = rect.inflate(-8, -8)
+
+    def __init__(self, capacidad=128, liberar=POOL_OBSTACULOS.liberar):
+        super().__init__(capacidad, liberar)
+
+    def _vista(self, i):
+        return VistaObstaculo(self, i)
+
+
+class TablaItems(_Tabla):
+    tipos = TIPOS_ITEM
+
+    def __init__(self, capacidad=32, liberar=POOL_ITEMS.liberar):
+        super().__init__(capacidad, liberar)
+
+    def _vista(self, i):
+        return VistaItem(self, i)
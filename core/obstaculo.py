@@ -2,7 +2,9 @@
 import pygame
 import random
 import os
-from settings import ANCHO, ALTO, ALTURA_SUELO, COLOR_OBSTACULO
+from settings import ANCHO, ALTO, ALTURA_SUELO, COLOR_OBSTACULO, POOL_OBSTACULOS_MAX
+from core.texturas import TextureStore
+from core.pool import Pool
 
 # posible(s) ubicación(es) para la imagen de obstáculo "1.png"
 _POSSIBLE_OBSTACLE_PATHS = [
@@ -11,6 +13,9 @@ _POSSIBLE_OBSTACLE_PATHS = [
     os.path.join("assets", "players", "1.png"),
 ]
 
+# textura compartida por todos los obstáculos: '1.png' se decodifica una sola vez
+OBSTACLE_TEXTURES = TextureStore(_POSSIBLE_OBSTACLE_PATHS)
+
 class Obstaculo:
     """
     Obstáculo rectangular; puede ser 'suelo' (desde el suelo hacia arriba)
@@ -18,8 +23,19 @@ class Obstaculo:
 
     Ahora intenta usar la imagen '1.png' escalada al tamaño del obstáculo.
     Si la imagen no está disponible o falla la carga, usa el rectángulo de color.
+    rng: generador de aleatorios a usar (por defecto el módulo random global).
+
+    Se reutilizan desde POOL_OBSTACULOS: reset() deja el objeto como recién creado.
     """
-    def __init__(self, tipo, offset_x=0):
+    __slots__ = ("tipo", "color", "velocidad", "image", "ancho", "alto", "x", "y",
+                 "rect", "hitbox", "prev_x", "_image_pedida")
+
+    def __init__(self, tipo, offset_x=0, rng=random):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.reset(tipo, offset_x, rng)
+
+    def reset(self, tipo, offset_x=0, rng=random):
         self.tipo = tipo
         self.color = COLOR_OBSTACULO
         self.velocidad = 8
@@ -27,9 +43,9 @@ class Obstaculo:
 
         if self.tipo == "suelo":
             # Ancho/alto razonables para obstáculo de suelo
-            self.ancho = random.randint(70, 100)
+            self.ancho = rng.randint(70, 100)
             # altura del obstáculo (debe ser pasable saltando)
-            self.alto = random.randint(90, 130)
+            self.alto = rng.randint(90, 130)
             self.x = ANCHO + offset_x
             self.y = ALTO - ALTURA_SUELO - self.alto
 
@@ -37,7 +53,7 @@ class Obstaculo:
             # Hueco exacto: el obstáculo parte desde el techo y baja hasta casi el suelo,
             # dejando un hueco para el jugador agachado.
             hueco = 60  # espacio libre desde el suelo hacia arriba (ajustable)
-            self.ancho = random.randint(70, 100)
+            self.ancho = rng.randint(70, 100)
             self.alto = ALTO - ALTURA_SUELO - hueco
             self.x = ANCHO + offset_x
             self.y = 0
@@ -49,38 +65,42 @@ class Obstaculo:
             self.x = ANCHO + offset_x
             self.y = ALTO - ALTURA_SUELO - self.alto
 
-        self.rect = pygame.Rect(self.x, self.y, self.ancho, self.alto)
+        self.rect.update(self.x, self.y, self.ancho, self.alto)
+        # hitbox de colisión (algo menor que el dibujo); se mueve junto con rect
+        self.hitbox.update(self.x + 4, self.y + 4, self.ancho - 8, self.alto - 8)
+        # x antes del último movimiento (para interpolar al dibujar)
+        self.prev_x = self.rect.x
 
-        # Intentar cargar la imagen '1.png' y escalarla al tamaño (ancho x alto).
-        # Hacemos esto aquí (en __init__) para evitar errores antes de set_mode.
-        self._try_load_image()
+        # La imagen '1.png' escalada se pide a la cache compartida en el primer dibujado.
+        self._image_pedida = False
 
     def _try_load_image(self):
-        """Intenta cargar la imagen desde varias rutas; si falla, self.image queda None."""
-        for p in _POSSIBLE_OBSTACLE_PATHS:
-            try:
-                if os.path.isfile(p):
-                    surf = pygame.image.load(p).convert_alpha()
-                    # escalar a tamaño del rect
-                    if surf.get_width() > 0 and surf.get_height() > 0:
-                        surf_scaled = pygame.transform.smoothscale(surf, (self.ancho, self.alto))
-                        self.image = surf_scaled
-                        return
-            except Exception as e:
-                # no abortamos: seguimos intentando otras rutas o quedamos en None
-                print(f"[WARN] fallo cargando imagen de obstáculo '{p}': {e}")
-                self.image = None
-        # si ninguna ruta funcionó, dejamos self.image = None (fallback rect)
+        """Pide la textura escalada a OBSTACLE_TEXTURES; si no hay imagen, self.image queda None."""
+        self._image_pedida = True
+        self.image = OBSTACLE_TEXTURES.get(self.ancho, self.alto)
 
     def mover(self, velocidad_juego=8):
-        self.rect.x -= int(velocidad_juego)
+        self.prev_x = self.rect.x
+        dx = int(velocidad_juego)
+        self.rect.x -= dx
+        self.hitbox.x -= dx
 
-    def dibujar(self, ventana):
+    def dibujar(self, ventana, alpha=1.0):
+        """alpha: fracción del tick actual (0 = posición anterior, 1 = posición actual)."""
+        if not self._image_pedida:
+            self._try_load_image()
+        rect = self.rect
+        if alpha < 1.0:
+            rect = rect.move(int((self.prev_x - rect.x) * (1.0 - alpha)), 0)
         if self.image:
             try:
-                ventana.blit(self.image, self.rect.topleft)
+                # la textura puede ser algo mayor (cubetas de tamaño): recortamos al rect
+                ventana.blit(self.image, rect.topleft, (0, 0, rect.width, rect.height))
             except Exception:
                 # en caso de cualquier problema al blitear, dibujamos el rect de color
-                pygame.draw.rect(ventana, self.color, self.rect)
+                pygame.draw.rect(ventana, self.color, rect)
         else:
-            pygame.draw.rect(ventana, self.color, self.rect)
+            pygame.draw.rect(ventana, self.color, rect)
+
+
+POOL_OBSTACULOS = Pool(Obstaculo, POOL_OBSTACULOS_MAX)
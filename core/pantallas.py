@@ -0,0 +1,126 @@
+# core/pantallas.py
+"""
+Pantallas estáticas (tutorial, selección, game over) compuestas una sola vez.
+
+PantallaCacheada guarda la superficie ya dibujada y solo la reconstruye cuando
+cambia su clave (récords, selección, ...). Quien la usa la blitea y actualiza la
+pantalla únicamente cuando hubo cambios; las partes animadas se dibujan aparte y
+se actualizan con pygame.display.update(rects).
+"""
+import pygame
+
+# eventos tras los que hay que volver a presentar la pantalla completa
+_EVENTOS_REDIBUJAR = tuple(t for t in (getattr(pygame, "VIDEOEXPOSE", None),
+                                       getattr(pygame, "WINDOWEXPOSED", None),
+                                       getattr(pygame, "WINDOWSHOWN", None),
+                                       getattr(pygame, "WINDOWRESTORED", None)) if t is not None)
+
+
+def requiere_redibujar(evento):
+    """True si el evento indica que la ventana perdió su contenido."""
+    return evento.type in _EVENTOS_REDIBUJAR
+
+
+class PantallaCacheada:
+    """
+    construir(surface, *args) dibuja la pantalla completa sobre `surface`.
+    obtener(tamano, clave, *args) devuelve (surface, cambio); solo llama a construir
+    si la clave o el tamaño son distintos a los de la última vez.
+    """
+
+    def __init__(self, construir):
+        self._construir = construir
+        self.surface = None
+        self.clave = None
+
+    def invalidar(self):
+        self.clave = None
+
+    def obtener(self, tamano, clave, *args):
+        tamano = tuple(tamano)
+        if self.surface is not None and self.clave == clave and self.surface.get_size() == tamano:
+            return self.surface, False
+        if self.surface is None or self.surface.get_size() != tamano:
+            self.surface = pygame.Surface(tamano)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+        self._construir(self.surface, *args)
+        self.clave = clave
+        return self.surface, True
+
+
+class GrillaTarjetas:
+    """
+    Disposición de n tarjetas de tamaño `caja` en filas dentro de `area`, con scroll
+    vertical por filas. Solo las filas visibles tienen rect, así que dibujar la pantalla
+    cuesta lo mismo con 2 personajes que con 50.
+    """
+
+    def __init__(self, n, caja, area, gap=60, gap_y=None):
+        self.n = n
+        self.caja_w, self.caja_h = caja
+        self.area = pygame.Rect(area)
+        self.paso_x = self.caja_w + gap
+        self.paso_y = self.caja_h + (gap if gap_y is None else gap_y)
+        cabe_x = max(1, (self.area.width + gap) // self.paso_x)
+        self.columnas = max(1, min(n, cabe_x))
+        self.filas = max(1, -(-n // self.columnas))
+        cabe_y = max(1, (self.area.height + self.paso_y - self.caja_h) // self.paso_y)
+        self.filas_visibles = min(self.filas, cabe_y)
+        self.primera_fila = 0
+        # todo centrado en el área (con una sola fila queda como la selección de siempre)
+        ancho = self.columnas * self.paso_x - (self.paso_x - self.caja_w)
+        alto = self.filas_visibles * self.paso_y - (self.paso_y - self.caja_h)
+        self._x0 = self.area.x + (self.area.width - ancho) // 2
+        self._y0 = self.area.y + (self.area.height - alto) // 2
+
+    @property
+    def hay_scroll(self):
+        return self.filas > self.filas_visibles
+
+    def visibles(self):
+        """Índices de las tarjetas en las filas visibles."""
+        inicio = self.primera_fila * self.columnas
+        return range(inicio, min(self.n, inicio + self.filas_visibles * self.columnas))
+
+    def rect(self, i):
+        """Rect de la tarjeta i, o None si está fuera de las filas visibles."""
+        fila, col = divmod(i, self.columnas)
+        fila -= self.primera_fila
+        if not 0 <= fila < self.filas_visibles or not 0 <= i < self.n:
+            return None
+        return pygame.Rect(self._x0 + col * self.paso_x, self._y0 + fila * self.paso_y, self.caja_w, self.caja_h)
+
+    def indice_en(self, pos):
+        """Tarjeta bajo `pos` (None si no hay ninguna)."""
+        for i in self.visibles():
+            if self.rect(i).collidepoint(pos):
+                return i
+        return None
+
+    def desplazar(self, filas):
+        """Mueve el scroll `filas` filas (negativo = hacia arriba); True si cambió."""
+        nueva = max(0, min(self.filas - self.filas_visibles, self.primera_fila + filas))
+        cambio = nueva != self.primera_fila
+        self.primera_fila = nueva
+        return cambio
+
+    def asegurar_visible(self, i):
+        """Ajusta el scroll para que se vea la tarjeta i; True si cambió."""
+        fila = i // self.columnas
+        if fila < self.primera_fila:
+            return self.desplazar(fila - self.primera_fila)
+        if fila >= self.primera_fila + self.filas_visibles:
+            return self.desplazar(fila - self.primera_fila - self.filas_visibles + 1)
+        return False
+
+    def mover(self, i, dx, dy):
+        """Índice tras moverse dx columnas (con vuelta entre filas) y dy filas desde i."""
+        if dx:
+            return (i + dx) % self.n
+        destino = i + dy * self.columnas
+        if destino < 0 or destino >= self.n:
+            # al salir por arriba/abajo: última o primera fila de la misma columna
+            col = i % self.columnas
+            destino = col if destino >= self.n else min(self.n - 1, (self.filas - 1) * self.columnas + col)
+        return destino
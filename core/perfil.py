@@ -0,0 +1,173 @@
+# core/perfil.py
+"""
+Medición por etapas del bucle principal.
+
+Cada frame se divide en etapas (input, spawns, obstáculos, ...); perfil.marca(etapa)
+suma al frame actual el tiempo transcurrido desde la marca anterior. Los frames se
+guardan en un buffer circular. Con el perfil apagado, marca() retorna de inmediato
+y no se guarda nada.
+
+En el juego: F3 muestra/oculta la gráfica (y activa la medición), F4 guarda el buffer en CSV.
+"""
+import os
+import time
+from array import array
+
+import pygame
+from core.utils import obtener_fuente
+
+ETAPAS = ("input", "jugador", "spawns", "obstaculos", "items", "poderes",
+          "fondo", "entidades", "hud", "flip")
+
+# colores de cada etapa en la gráfica
+_COLORES = {
+    "input": (120, 120, 120),
+    "jugador": (95, 95, 220),
+    "spawns": (255, 160, 0),
+    "obstaculos": (180, 50, 50),
+    "items": (200, 200, 255),
+    "poderes": (180, 0, 255),
+    "fondo": (0, 150, 90),
+    "entidades": (0, 200, 255),
+    "hud": (255, 255, 0),
+    "flip": (230, 230, 230),
+}
+
+PERFIL_DIR = "perfil"
+PRESUPUESTO_MS = 1000 / 30
+
+
+class FrameProfiler:
+    def __init__(self, capacidad=300, etapas=ETAPAS):
+        self.capacidad = capacidad
+        self.etapas = tuple(etapas)
+        self.activo = False
+        self.overlay = False
+        # un slot extra: el del frame en curso nunca se confunde con el más viejo
+        self._slots = capacidad + 1
+        self._datos = {e: array("d", bytes(8 * self._slots)) for e in self.etapas}
+        self._idx = 0
+        self._n = 0
+        self._ultima = 0.0
+        self._frames_total = 0
+        self._stats = {}
+        self._stats_frame = -1
+        self._fuente = None
+
+    def alternar(self):
+        """Hotkey de la gráfica: mostrarla también activa la medición."""
+        self.overlay = not self.overlay
+        self.activo = self.overlay
+        if self.activo:
+            # empezamos a medir a mitad de frame (desde el manejo de eventos)
+            self._n = 0
+            self._idx = 0
+            for datos in self._datos.values():
+                datos[0] = 0.0
+            self._ultima = time.perf_counter()
+
+    def inicio_frame(self):
+        if not self.activo:
+            return
+        i = self._idx
+        for datos in self._datos.values():
+            datos[i] = 0.0
+        self._ultima = time.perf_counter()
+
+    def marca(self, etapa):
+        if not self.activo:
+            return
+        ahora = time.perf_counter()
+        self._datos[etapa][self._idx] += (ahora - self._ultima) * 1000.0
+        self._ultima = ahora
+
+    def fin_frame(self):
+        if not self.activo:
+            return
+        self._idx = (self._idx + 1) % self._slots
+        self._n = min(self._n + 1, self.capacidad)
+        self._frames_total += 1
+
+    def _orden(self):
+        """Índices del buffer del frame más viejo al más nuevo."""
+        inicio = (self._idx - self._n) % self._slots
+        return [(inicio + k) % self._slots for k in range(self._n)]
+
+    def estadisticas(self):
+        """{etapa: (p50, p99)} en ms, más 'total'. Se recalcula como mucho cada 15 frames."""
+        if self._stats_frame >= 0 and self._frames_total - self._stats_frame < 15:
+            return self._stats
+        orden = self._orden()
+        stats = {}
+        totales = [0.0] * len(orden)
+        for e in self.etapas:
+            datos = self._datos[e]
+            valores = [datos[i] for i in orden]
+            for k, v in enumerate(valores):
+                totales[k] += v
+            stats[e] = _p50_p99(valores)
+        stats["total"] = _p50_p99(totales)
+        self._stats = stats
+        self._stats_frame = self._frames_total
+        return stats
+
+    def exportar_csv(self, ruta=None):
+        """Guarda el buffer (un frame por fila, ms por etapa) y devuelve la ruta."""
+        if ruta is None:
+            ruta = os.path.join(PERFIL_DIR, time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write("frame," + ",".join(self.etapas) + ",total\n")
+            for k, i in enumerate(self._orden()):
+                valores = [self._datos[e][i] for e in self.etapas]
+                f.write(f"{k}," + ",".join(f"{v:.4f}" for v in valores) + f",{sum(valores):.4f}\n")
+        return ruta
+
+    def dibujar(self, ventana, x=None, y=10):
+        """Gráfica apilada de los últimos frames y tabla p50/p99 por etapa; devuelve el rect del panel."""
+        if not self.overlay:
+            return None
+        if self._fuente is None:
+            self._fuente = obtener_fuente(None, 18)
+        ancho_graf, alto_graf = 300, 120
+        ancho, alto = ancho_graf + 20, alto_graf + 30 + 16 * (len(self.etapas) + 1)
+        if x is None:
+            x = ventana.get_width() - ancho - 10
+        panel = pygame.Rect(x, y, ancho, alto)
+        pygame.draw.rect(ventana, (10, 10, 10), panel)
+        pygame.draw.rect(ventana, (200, 200, 200), panel, 1)
+
+        # barras apiladas: 1 px por frame, escala 2 * presupuesto
+        escala = alto_graf / (2 * PRESUPUESTO_MS)
+        base_y = y + 10 + alto_graf
+        orden = self._orden()[-ancho_graf:]
+        for col, i in enumerate(orden):
+            yy = base_y
+            for e in self.etapas:
+                h = self._datos[e][i] * escala
+                if h >= 1:
+                    pygame.draw.line(ventana, _COLORES.get(e, (200, 200, 200)),
+                                     (x + 10 + col, yy), (x + 10 + col, max(y + 10, yy - h)))
+                yy -= h
+        linea_y = base_y - int(PRESUPUESTO_MS * escala)
+        pygame.draw.line(ventana, (255, 80, 80), (x + 10, linea_y), (x + 10 + ancho_graf, linea_y))
+
+        stats = self.estadisticas()
+        ty = base_y + 8
+        for e in self.etapas + ("total",):
+            p50, p99 = stats.get(e, (0.0, 0.0))
+            color = _COLORES.get(e, (255, 255, 255))
+            surf = self._fuente.render(f"{e:<11} p50 {p50:6.2f}  p99 {p99:6.2f} ms", True, color)
+            ventana.blit(surf, (x + 10, ty))
+            ty += 16
+        return panel
+
+
+def _p50_p99(valores):
+    if not valores:
+        return (0.0, 0.0)
+    ordenados = sorted(valores)
+    n = len(ordenados)
+    return (ordenados[(n - 1) // 2], ordenados[min(n - 1, int(round((n - 1) * 0.99)))])
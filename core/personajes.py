@@ -0,0 +1,178 @@
+# core/personajes.py
+"""
+Animaciones de los personajes, cargadas bajo demanda.
+
+Al arrancar solo hace falta una preview por personaje para la pantalla de selección:
+una animación con sus frames ya escalados al tamaño de la tarjeta (y nada más). El set
+completo (todas las animaciones que Player reproduce, con los frames escalados a su
+alto de juego) se carga al elegir el personaje, y liberar_excepto() suelta los sets de
+los que ya no se usan. Así la memoria y el arranque dependen de lo que se juega, no de
+cuántos personajes haya en el roster.
+
+Todo pasa por core.cache_assets (y por el pool de core.assets cuando son varios archivos).
+"""
+import os
+
+from core import cache_assets
+from core.assets import cargar_en_paralelo, convertir
+from core.player import altura_jugador, altura_agachado
+from core.sprites import AnimatedSprite
+
+# animaciones que Player sabe reproducir (el resto de sheets, p. ej. "death", no se cargan)
+ANIMACIONES_JUGADOR = ("idle", "run", "jump", "fall", "roll")
+# orden de preferencia para la preview de la selección
+PREFERENCIA_PREVIEW = ("idle", "run", "jump", "fall", "roll")
+
+
+def fps_animacion(key):
+    # run/roll más rápido
+    return 12 if key in ("run", "roll") else 8
+
+
+def recortar_centro(surf, tamano):
+    """Copia de la parte central de surf de como mucho `tamano` (surf tal cual si ya cabe o sin tamano)."""
+    if tamano is None:
+        return surf
+    w, h = surf.get_size()
+    cw, ch = min(w, tamano[0]), min(h, tamano[1])
+    if (cw, ch) == (w, h):
+        return surf
+    return surf.subsurface(((w - cw) // 2, (h - ch) // 2, cw, ch)).copy()
+
+
+class BibliotecaPersonajes:
+    """
+    sprite_dir: carpeta de los sheets; sheets: {personaje: {animación: archivo}};
+    escalas: {personaje: factor de escala en juego} (por defecto escala_defecto).
+    """
+
+    def __init__(self, sprite_dir, sheets, escalas=None, escala_defecto=1.8):
+        self.sprite_dir = sprite_dir
+        self.sheets = sheets
+        self.escalas = escalas or {}
+        self.escala_defecto = escala_defecto
+        self._completas = {}   # personaje -> {animación: AnimatedSprite o None}
+        self._previews = {}    # personaje -> (alto, AnimatedSprite o None)
+
+    def nombres(self):
+        return list(self.sheets)
+
+    def escala(self, char):
+        return self.escalas.get(char, self.escala_defecto)
+
+    def _ruta(self, char, key):
+        return os.path.join(self.sprite_dir, self.sheets[char][key])
+
+    def _claves(self, char):
+        return [k for k in self.sheets.get(char, {}) if k in ANIMACIONES_JUGADOR]
+
+    def alto_sheet(self, char):
+        """Mayor alto de los sheets del personaje (de las cabeceras PNG, sin decodificar)."""
+        altos = [cache_assets.alto_png(self._ruta(char, k)) for k in self._claves(char)]
+        altos = [a for a in altos if a]
+        return max(altos) if altos else None
+
+    def alturas(self, char):
+        """Altos (de pie, agachado) a los que Player dibujará al personaje."""
+        alto_sheet = self.alto_sheet(char)
+        if not alto_sheet:
+            return ()
+        alto = altura_jugador(alto_sheet, self.escala(char))
+        return (alto, altura_agachado(alto))
+
+    # --- set completo ---
+
+    def tareas(self, char):
+        """Tareas (para cargar_en_paralelo) del set completo de char."""
+        alturas = self.alturas(char)
+        return {("sheet", char, key): (cache_assets.sheet, self._ruta(char, key), alturas)
+                for key in self._claves(char)}
+
+    def armar(self, char, resultados):
+        """Convierte los frames de las tareas de char (hilo principal) y guarda el set."""
+        anims = {}
+        for key in self._claves(char):
+            res = resultados.get(("sheet", char, key))
+            if isinstance(res, Exception) or res is None:
+                print(f"[WARN] no se pudo cargar '{self.sheets[char][key]}' para '{char}': {res}")
+                anims[key] = None
+                continue
+            frames, metas, escalados = res
+            escalados = {alto: [convertir(f) for f in lista] for alto, lista in escalados.items()}
+            anims[key] = AnimatedSprite.desde_frames([convertir(f) for f in frames], fps_animacion(key),
+                                                     metas, escalados)
+        self._completas[char] = anims
+        return anims
+
+    def cargar(self, char, al_progresar=None):
+        """{animación: AnimatedSprite o None} de char, cargándolo si hace falta."""
+        anims = self._completas.get(char)
+        if anims is None:
+            anims = self.armar(char, cargar_en_paralelo(self.tareas(char), al_progresar))
+        return anims
+
+    def animaciones(self, char, al_progresar=None):
+        """Solo las animaciones que se pudieron cargar (lo que recibe Player.set_sprite)."""
+        return {k: a for k, a in self.cargar(char, al_progresar).items() if a}
+
+    def cargados(self):
+        return list(self._completas)
+
+    def liberar_excepto(self, *conservar):
+        """Suelta los sets completos de los personajes que no están en `conservar`; devuelve cuántos."""
+        sobran = [c for c in self._completas if c not in conservar]
+        for char in sobran:
+            del self._completas[char]
+        return len(sobran)
+
+    # --- previews ---
+
+    def clave_preview(self, char):
+        claves = self._claves(char)
+        for pref in PREFERENCIA_PREVIEW:
+            if pref in claves:
+                return pref
+        return None
+
+    def tarea_preview(self, char, alto):
+        key = self.clave_preview(char)
+        if key is None or not alto:
+            return {}
+        return {("preview", char): (cache_assets.sheet, self._ruta(char, key), (alto,), None, "preview")}
+
+    def armar_preview(self, char, alto, resultados, recorte=None):
+        """recorte: (ancho, alto) máximo de los frames; lo que sobra (centrado) se descarta."""
+        res = resultados.get(("preview", char))
+        anim = None
+        if isinstance(res, Exception):
+            print(f"[WARN] no se pudo cargar la preview de '{char}': {res}")
+        elif res is not None:
+            # solo los frames al tamaño de la tarjeta: los de tamaño original no se guardan
+            _, _, escalados = res
+            frames = [convertir(recortar_centro(f, recorte)) for f in escalados[alto]]
+            # la preview no la dibuja Player: no necesita FrameMeta
+            anim = AnimatedSprite.desde_frames(frames, fps_animacion(self.clave_preview(char)), meta=[])
+        self._previews[char] = (alto, anim)
+        return anim
+
+    def preview(self, char, alto=None, recorte=None):
+        """AnimatedSprite de preview de char (None si no tiene); alto y recorte solo hacen falta la primera vez."""
+        guardada = self._previews.get(char)
+        if guardada is not None and (alto is None or guardada[0] == alto):
+            return guardada[1]
+        if alto is None:
+            return None
+        return self.armar_preview(char, alto, cargar_en_paralelo(self.tarea_preview(char, alto)), recorte)
+
+    def bytes_cargados(self):
+        """Memoria aproximada (RGBA) de los frames cargados: {personaje: bytes}, previews aparte."""
+        def tam(anim):
+            if anim is None:
+                return 0
+            total = sum(f.get_width() * f.get_height() * 4 for f in anim.frames)
+            for lista in anim.escalados.values():
+                total += sum(f.get_width() * f.get_height() * 4 for f in lista)
+            return total
+        uso = {char: sum(tam(a) for a in anims.values()) for char, anims in self._completas.items()}
+        uso["previews"] = sum(tam(anim) for _, anim in self._previews.values())
+        return uso
@@ -1,6 +1,26 @@
 # core/player.py
+from collections import OrderedDict
+
 import pygame
 from settings import ALTO, ALTURA_SUELO, COLOR_JUGADOR
+from core.sprites import escalar_frame
+
+# máximo de frames escalados guardados por jugador (se descartan los menos usados)
+FRAME_CACHE_MAX = 96
+
+# física del salto (px y px/tick); core.simulacion_np usa las mismas
+IMPULSO_SALTO = -22
+GRAVEDAD = 1.2
+VELOCIDAD_MAX_CAIDA = 40
+
+def altura_jugador(frame_h, factor=1.8):
+    """Alto del rect del jugador de pie para un sprite de frame_h píxeles escalado por factor."""
+    return max(60, int(frame_h * factor))
+
+
+def altura_agachado(tamano):
+    return max(20, int(tamano * 0.55))
+
 
 def _lowest_nontransparent_row(surf: pygame.Surface) -> int:
     w, h = surf.get_size()
@@ -27,8 +47,10 @@ class Player:
 
         # Física
         self.velocidad_y = 0.0
-        self.gravedad = 1.2
+        self.gravedad = GRAVEDAD
         self.en_suelo = True
+        # bottom antes del último movimiento (para interpolar al dibujar)
+        self.prev_bottom = self.rect.bottom
 
         # Estados
         self.agachado = False
@@ -39,16 +61,65 @@ class Player:
         self.sprite_offset = (0, 0)
         self.current_anim_key = "idle"
 
+        # cache de frames ya escalados: (anim, índice, alto, agachado) -> (img, offset_y)
+        self._frame_cache = OrderedDict()
+        self._sombra_surf = None
+
+    def _frame_escalado(self, anim_key, anim):
+        """Devuelve (img, baseline_offset) del frame actual escalado al alto del rect, usando la cache."""
+        key = (anim_key, anim.index, self.rect.height, self.agachado)
+        cached = self._frame_cache.get(key)
+        if cached is not None:
+            self._frame_cache.move_to_end(key)
+            return cached
+        frame = anim.get_frame()
+        fh = frame.get_height()
+        scale = self.rect.height / fh if fh > 0 else 1.0
+        # frames ya escalados a este alto (p. ej. desde la cache de assets en disco)
+        escalados = getattr(anim, "escalados", None)
+        if escalados and self.rect.height in escalados:
+            img = escalados[self.rect.height][anim.index]
+        else:
+            img = escalar_frame(frame, self.rect.height)
+
+        # corregir padding inferior del frame para alinear "pies"
+        # (la baseline viene precalculada en el sprite; solo se escanea si no la tiene)
+        meta = getattr(anim, "meta", None)
+        baseline_row = meta[anim.index].baseline if meta else _lowest_nontransparent_row(frame)
+        baseline_offset = (fh - 1 - baseline_row)
+        entry = (img, int(baseline_offset * scale))
+
+        self._frame_cache[key] = entry
+        if len(self._frame_cache) > FRAME_CACHE_MAX:
+            self._frame_cache.popitem(last=False)
+        return entry
+
+    def _static_escalado(self):
+        key = ("__static__", 0, self.rect.height, self.agachado)
+        cached = self._frame_cache.get(key)
+        if cached is None:
+            img = pygame.transform.smoothscale(self.static_sprite, (self.rect.width, self.rect.height))
+            cached = (img, 0)
+            self._frame_cache[key] = cached
+            if len(self._frame_cache) > FRAME_CACHE_MAX:
+                self._frame_cache.popitem(last=False)
+        return cached
+
     def manejar_eventos(self, keys):
+        self.aplicar_entrada(keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP],
+                             keys[pygame.K_DOWN] or keys[pygame.K_s])
+
+    def aplicar_entrada(self, saltar, agachar):
+        """Igual que manejar_eventos pero con la entrada ya resuelta (sin teclado)."""
         # Saltar
-        if (keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]) and self.en_suelo and not self.agachado:
-            self.velocidad_y = -22
+        if saltar and self.en_suelo and not self.agachado:
+            self.velocidad_y = IMPULSO_SALTO
             self.en_suelo = False
 
         # Agacharse: solo en suelo
-        if (keys[pygame.K_DOWN] or keys[pygame.K_s]) and self.en_suelo:
+        if agachar and self.en_suelo:
             if not self.agachado:
-                altura_reducida = max(20, int(self.tamano_original * 0.55))
+                altura_reducida = altura_agachado(self.tamano_original)
                 bottom = self.rect.bottom
                 self.rect.height = altura_reducida
                 self.rect.bottom = bottom
@@ -61,12 +132,13 @@ class Player:
                 self.agachado = False
 
     def mover(self):
+        self.prev_bottom = self.rect.bottom
         self.rect.y += int(self.velocidad_y)
 
         if not self.en_suelo:
             self.velocidad_y += self.gravedad
-            if self.velocidad_y > 40:
-                self.velocidad_y = 40
+            if self.velocidad_y > VELOCIDAD_MAX_CAIDA:
+                self.velocidad_y = VELOCIDAD_MAX_CAIDA
 
         ground_y = ALTO - ALTURA_SUELO
         if self.rect.bottom >= ground_y:
@@ -93,57 +165,62 @@ class Player:
                     else:
                         self.current_anim_key = "idle"
 
-    def dibujar(self, ventana):
+    def dibujar(self, ventana, alpha=1.0, sombra=True):
+        """
+        alpha: fracción del tick actual (0 = posición anterior, 1 = posición actual).
+        sombra: False para no dibujar la sombra (calidad reducida).
+        """
+        rect = self.rect
+        if alpha < 1.0:
+            rect = rect.move(0, int((self.prev_bottom - rect.bottom) * (1.0 - alpha)))
+
         # sombra simple
-        try:
-            sombra_w = max(1, self.rect.width)
-            sombra_h = max(6, self.rect.height // 8)
-            sombra_surf = pygame.Surface((sombra_w, sombra_h), pygame.SRCALPHA)
-            sombra_surf.fill((0, 0, 0, 100))
-            sombra_pos = (self.rect.left, self.rect.bottom - sombra_h // 2)
-            ventana.blit(sombra_surf, sombra_pos)
-        except Exception:
-            pass
+        if sombra:
+            try:
+                sombra_w = max(1, rect.width)
+                sombra_h = max(6, rect.height // 8)
+                sombra_surf = self._sombra_surf
+                if sombra_surf is None or sombra_surf.get_size() != (sombra_w, sombra_h):
+                    sombra_surf = pygame.Surface((sombra_w, sombra_h), pygame.SRCALPHA)
+                    sombra_surf.fill((0, 0, 0, 100))
+                    self._sombra_surf = sombra_surf
+                sombra_pos = (rect.left, rect.bottom - sombra_h // 2)
+                ventana.blit(sombra_surf, sombra_pos)
+            except Exception:
+                pass
 
         if self.animations:
             anim = self.animations.get(self.current_anim_key)
             if anim:
                 try:
                     anim.update()
-                    frame = anim.get_frame()
-                    fw, fh = frame.get_width(), frame.get_height()
-                    scale = self.rect.height / fh if fh > 0 else 1.0
-                    new_w = max(1, int(fw * scale))
-                    new_h = max(1, int(fh * scale))
-                    img = pygame.transform.smoothscale(frame, (new_w, new_h))
-
-                    # corregir padding inferior del frame para alinear "pies"
-                    baseline_row = _lowest_nontransparent_row(frame)
-                    baseline_offset = (fh - 1 - baseline_row)
-                    baseline_offset_scaled = int(baseline_offset * scale)
+                    img, baseline_offset_scaled = self._frame_escalado(self.current_anim_key, anim)
+                    new_w, new_h = img.get_width(), img.get_height()
 
                     sx, sy = self.sprite_offset
-                    draw_x = self.rect.left + sx + (self.rect.width - new_w) // 2
-                    draw_y = self.rect.bottom - new_h + sy + baseline_offset_scaled
+                    draw_x = rect.left + sx + (rect.width - new_w) // 2
+                    draw_y = rect.bottom - new_h + sy + baseline_offset_scaled
 
                     ventana.blit(img, (draw_x, draw_y))
                 except Exception:
-                    pygame.draw.rect(ventana, self.color, self.rect)
+                    pygame.draw.rect(ventana, self.color, rect)
             else:
-                pygame.draw.rect(ventana, self.color, self.rect)
+                pygame.draw.rect(ventana, self.color, rect)
         elif self.static_sprite:
             try:
-                img = pygame.transform.smoothscale(self.static_sprite, (self.rect.width, self.rect.height))
+                img, _ = self._static_escalado()
                 sx, sy = self.sprite_offset
-                ventana.blit(img, (self.rect.left + sx, self.rect.top + sy))
+                ventana.blit(img, (rect.left + sx, rect.top + sy))
             except Exception:
-                pygame.draw.rect(ventana, self.color, self.rect)
+                pygame.draw.rect(ventana, self.color, rect)
         else:
-            pygame.draw.rect(ventana, self.color, self.rect)
+            pygame.draw.rect(ventana, self.color, rect)
 
         # Nota: ya no dibujamos el borde blanco al agacharnos (solicitado)
 
     def set_sprite(self, surf_or_dict, scale_factor: float | None = None):
+        # los frames escalados dependen del sprite y del tamaño: invalidar
+        self._frame_cache.clear()
         if isinstance(surf_or_dict, dict):
             self.animations = surf_or_dict
             self.static_sprite = None
@@ -159,7 +236,7 @@ class Player:
                     pass
             if max_frame_h > 0:
                 factor = scale_factor if (scale_factor is not None) else 1.8
-                nuevo_alto = max(60, int(max_frame_h * factor))
+                nuevo_alto = altura_jugador(max_frame_h, factor)
                 self.tamano_original = nuevo_alto
             bottom = self.rect.bottom
             self.rect.height = self.tamano_original
@@ -172,7 +249,7 @@ class Player:
                 h = surf_or_dict.get_height()
                 if h and h > 0:
                     factor = scale_factor if (scale_factor is not None) else 1.8
-                    nuevo_alto = max(60, int(h * factor))
+                    nuevo_alto = altura_jugador(h, factor)
                     self.tamano_original = nuevo_alto
                     bottom = self.rect.bottom
                     self.rect.height = self.tamano_original
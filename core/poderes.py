@@ -0,0 +1,342 @@
+# core/poderes.py
+"""
+Motor de poderes (power-ups) de la partida.
+
+EstadoPoderes reúne con __slots__ lo que antes era el dict `estado`: nivel, velocidad,
+escudo/invulnerabilidad, la pila de poderes pendientes (deque), la revelación de la
+caja misteriosa y los destellos de nivel.
+
+Cada poder es una clase registrada con @registrar_poder, con su peso en la caja
+misteriosa y el nivel mínimo en que puede salir. Las duraciones se programan en un
+heap de temporizadores: por tick solo se tocan los que vencieron, y cada uno vuelve a
+comprobar su condición al vencer (si el plazo se alargó, ya hay otra entrada más tarde).
+
+Las elecciones al azar usan una TablaPesos (pesos acumulados precalculados + bisect):
+un rng.random() por elección, igual que rng.choices, así que con la misma semilla
+salen los mismos resultados.
+"""
+import heapq
+import math
+import random
+from bisect import bisect
+from collections import Counter, deque
+from itertools import accumulate
+
+VELOCIDAD_INICIAL = 15.0
+MULTIPLICADOR_VELOCIDAD = 1.25
+
+# duraciones (ms de simulación)
+DURACION_INVULNERABLE_MS = 10000
+DURACION_INVULNERABLE_ESCUDO_MS = 2000
+DURACION_DESTELLO_MS = 1000
+DURACION_REVELACION_MS = 1000
+PASO_ANIM_SLOT_MS = 100
+PASO_CONTADOR_MS = 1000
+CUENTA_STACK = 3
+
+COLOR_INVULNERABLE = (255, 215, 0)
+COLOR_INVULNERABLE_ESCUDO = (0, 200, 255)
+
+
+class TablaPesos:
+    """Elección ponderada con los pesos acumulados ya calculados."""
+    __slots__ = ("opciones", "acumulados", "total")
+
+    def __init__(self, opciones, pesos):
+        self.opciones = tuple(opciones)
+        self.acumulados = tuple(accumulate(pesos))
+        self.total = self.acumulados[-1]
+
+    def elegir(self, rng=random):
+        # mismo cálculo que random.choices(opciones, weights=pesos, k=1)[0]
+        return self.opciones[bisect(self.acumulados, rng.random() * self.total, 0, len(self.acumulados) - 1)]
+
+
+class EstadoPoderes:
+    """Estado de nivel y poderes de una partida (lo que lee el HUD)."""
+    __slots__ = ("velocidad", "nivel", "escudo", "invulnerable", "tiempo_invulnerable", "color_invul",
+                 "stack", "revelando", "efecto_revelado", "tiempo_revelacion", "slot_anim_frame",
+                 "slot_anim_last", "mostrar_reduccion", "tiempo_reduccion", "mostrar_subida",
+                 "tiempo_subida", "mostrar_desvalijado", "tiempo_desvalijado", "contador_stack",
+                 "tiempo_contador")
+
+    def __init__(self, nivel=1, velocidad=VELOCIDAD_INICIAL):
+        self.velocidad = velocidad
+        self.nivel = nivel
+        self.escudo = False
+        self.invulnerable = False
+        self.tiempo_invulnerable = 0
+        self.color_invul = COLOR_INVULNERABLE
+        self.stack = deque()
+        self.revelando = False
+        self.efecto_revelado = None
+        self.tiempo_revelacion = 0
+        self.slot_anim_frame = 0
+        self.slot_anim_last = 0
+        self.mostrar_reduccion = False
+        self.tiempo_reduccion = 0
+        self.mostrar_subida = False
+        self.tiempo_subida = 0
+        self.mostrar_desvalijado = False
+        self.tiempo_desvalijado = 0
+        self.contador_stack = 0
+        self.tiempo_contador = 0
+
+    @property
+    def protegido(self):
+        """Con escudo, invulnerable o revelando, los ítems recogidos van a la pila."""
+        return self.invulnerable or self.escudo or self.revelando
+
+    def como_dict(self):
+        d = {nombre: getattr(self, nombre) for nombre in self.__slots__}
+        d["stack"] = list(self.stack)
+        return d
+
+
+# --- poderes registrados ---
+
+PODERES = {}
+
+
+def registrar_poder(cls):
+    """Decorador: registra una instancia del poder bajo cls.nombre (el orden de registro es el de la caja)."""
+    PODERES[cls.nombre] = cls()
+    return cls
+
+
+class Poder:
+    nombre = ""
+    peso_misterioso = 0   # 0 = no sale de la caja misteriosa
+    nivel_minimo = 1      # la caja no lo ofrece por debajo de este nivel
+
+    def aplicar(self, motor, ahora):
+        raise NotImplementedError
+
+
+@registrar_poder
+class Escudo(Poder):
+    nombre = "escudo"
+    peso_misterioso = 25
+
+    def aplicar(self, motor, ahora):
+        motor.estado.escudo = True
+
+
+@registrar_poder
+class Reduccion(Poder):
+    nombre = "reduccion"
+    peso_misterioso = 20
+    nivel_minimo = 2
+
+    def aplicar(self, motor, ahora):
+        estado = motor.estado
+        if estado.nivel > 1:
+            estado.nivel -= 1
+            estado.velocidad /= MULTIPLICADOR_VELOCIDAD
+            motor.mostrar_destello("reduccion", ahora)
+
+
+@registrar_poder
+class Invulnerable(Poder):
+    nombre = "invulnerable"
+    peso_misterioso = 15
+
+    def aplicar(self, motor, ahora):
+        motor.poner_invulnerable(ahora, DURACION_INVULNERABLE_MS, COLOR_INVULNERABLE)
+
+
+@registrar_poder
+class Subir(Poder):
+    nombre = "subir"
+    peso_misterioso = 10
+
+    def aplicar(self, motor, ahora):
+        estado = motor.estado
+        estado.nivel += 1
+        estado.velocidad *= MULTIPLICADOR_VELOCIDAD
+        motor.mostrar_destello("subida", ahora)
+
+
+@registrar_poder
+class Desvalijado(Poder):
+    nombre = "desvalijado"
+    peso_misterioso = 5
+
+    def aplicar(self, motor, ahora):
+        motor.estado.stack.clear()
+        motor.mostrar_destello("desvalijado", ahora)
+
+
+_TABLAS_MISTERIOSO = {}
+
+
+def tabla_misterioso(nivel):
+    """TablaPesos de la caja misteriosa con los poderes disponibles en `nivel` (cacheada)."""
+    disponibles = tuple(p.nombre for p in PODERES.values()
+                        if p.peso_misterioso > 0 and nivel >= p.nivel_minimo)
+    tabla = _TABLAS_MISTERIOSO.get(disponibles)
+    if tabla is None:
+        tabla = TablaPesos(disponibles, [PODERES[n].peso_misterioso for n in disponibles])
+        _TABLAS_MISTERIOSO[disponibles] = tabla
+    return tabla
+
+
+# temporizadores, en el orden en que se atienden si vencen en el mismo tick
+_TEMPORIZADORES = ("slot", "revelacion", "invulnerable", "reduccion", "subida", "desvalijado")
+_ORDEN = {nombre: i for i, nombre in enumerate(_TEMPORIZADORES)}
+
+
+class MotorPoderes:
+    """
+    Reglas de los poderes sobre un EstadoPoderes.
+    rng: generador de la partida (la caja misteriosa lo consume).
+    """
+
+    def __init__(self, estado=None, rng=random):
+        self.estado = estado if estado is not None else EstadoPoderes()
+        self.rng = rng
+        self._timers = []   # heap de (instante, orden, nombre)
+        # uso en la partida (para estadísticas): poderes aplicados e ítems recogidos por tipo
+        self.aplicados = Counter()
+        self.recogidos = Counter()
+
+    def _programar(self, instante, nombre, estricto=False):
+        """estricto: vence cuando ahora > instante (si no, con ahora >= instante)."""
+        if estricto:
+            instante = math.nextafter(instante, math.inf)
+        heapq.heappush(self._timers, (instante, _ORDEN[nombre], nombre))
+
+    # --- acciones ---
+
+    def aplicar(self, nombre, ahora):
+        self.aplicados[nombre] += 1
+        PODERES[nombre].aplicar(self, ahora)
+
+    def poner_invulnerable(self, ahora, duracion, color):
+        estado = self.estado
+        estado.invulnerable = True
+        estado.tiempo_invulnerable = ahora + duracion
+        estado.color_invul = color
+        self._programar(estado.tiempo_invulnerable, "invulnerable", estricto=True)
+
+    def mostrar_destello(self, destello, ahora):
+        """destello: "reduccion", "subida" o "desvalijado"."""
+        estado = self.estado
+        setattr(estado, "mostrar_" + destello, True)
+        setattr(estado, "tiempo_" + destello, ahora + DURACION_DESTELLO_MS)
+        self._programar(ahora + DURACION_DESTELLO_MS, destello)
+
+    def elegir_misterioso(self):
+        return tabla_misterioso(self.estado.nivel).elegir(self.rng)
+
+    def empezar_revelacion(self, ahora, efecto=None):
+        estado = self.estado
+        estado.revelando = True
+        estado.efecto_revelado = efecto if efecto is not None else self.elegir_misterioso()
+        estado.tiempo_revelacion = ahora + DURACION_REVELACION_MS
+        estado.slot_anim_frame = 0
+        estado.slot_anim_last = ahora
+        self._programar(estado.tiempo_revelacion, "revelacion")
+        self._programar_slot(ahora)
+
+    def absorber_golpe(self, ahora):
+        """Choque con un obstáculo: True si la invulnerabilidad o el escudo lo absorben."""
+        estado = self.estado
+        if estado.invulnerable:
+            return True
+        if estado.escudo:
+            estado.escudo = False
+            self.poner_invulnerable(ahora, DURACION_INVULNERABLE_ESCUDO_MS, COLOR_INVULNERABLE_ESCUDO)
+            return True
+        return False
+
+    def recoger(self, tipo, ahora):
+        """Ítem recogido: a la pila si hay protección; si no, se aplica (o se revela)."""
+        self.recogidos[tipo] += 1
+        if self.estado.protegido:
+            self.estado.stack.append(tipo)
+        elif tipo == "misterioso":
+            self.empezar_revelacion(ahora)
+        else:
+            self.aplicar(tipo, ahora)
+
+    # --- por tick ---
+
+    def actualizar(self, ahora):
+        """Atiende los temporizadores vencidos."""
+        timers = self._timers
+        if not timers or timers[0][0] > ahora:
+            return
+        vencidos = set()
+        while timers and timers[0][0] <= ahora:
+            vencidos.add(heapq.heappop(timers)[1:])
+        for _, nombre in sorted(vencidos):
+            getattr(self, "_vence_" + nombre)(ahora)
+
+    def _programar_slot(self, ahora):
+        # un poco antes del paso: al vencer se comprueba la condición exacta y, si aún
+        # no se cumple por redondeo, se vuelve a mirar el tick siguiente
+        self._programar(ahora + PASO_ANIM_SLOT_MS - 1, "slot")
+
+    def _vence_slot(self, ahora):
+        estado = self.estado
+        if not estado.revelando:
+            return
+        if ahora - estado.slot_anim_last > PASO_ANIM_SLOT_MS:
+            estado.slot_anim_frame = (estado.slot_anim_frame + 1) % 5
+            estado.slot_anim_last = ahora
+            self._programar_slot(ahora)
+        else:
+            self._programar(ahora, "slot", estricto=True)
+
+    def _vence_revelacion(self, ahora):
+        estado = self.estado
+        if estado.revelando and ahora >= estado.tiempo_revelacion:
+            efecto = estado.efecto_revelado
+            estado.revelando = False
+            estado.efecto_revelado = None
+            self.aplicar(efecto, ahora)
+
+    def _vence_invulnerable(self, ahora):
+        estado = self.estado
+        if estado.invulnerable and ahora > estado.tiempo_invulnerable:
+            estado.invulnerable = False
+            estado.color_invul = COLOR_INVULNERABLE
+
+    def _vence_destello(self, destello, ahora):
+        estado = self.estado
+        if ahora >= getattr(estado, "tiempo_" + destello):
+            setattr(estado, "mostrar_" + destello, False)
+
+    def _vence_reduccion(self, ahora):
+        self._vence_destello("reduccion", ahora)
+
+    def _vence_subida(self, ahora):
+        self._vence_destello("subida", ahora)
+
+    def _vence_desvalijado(self, ahora):
+        self._vence_destello("desvalijado", ahora)
+
+    def actualizar_stack(self, ahora):
+        """
+        Sin protección, el primero de la pila se activa tras una cuenta de CUENTA_STACK
+        pasos. La cuenta solo avanza mientras no haya protección, así que se consulta
+        aquí (y solo con la pila no vacía) en vez de ir al heap.
+        """
+        estado = self.estado
+        if not estado.stack or estado.protegido:
+            return
+        if estado.contador_stack == 0:
+            estado.contador_stack = CUENTA_STACK
+            estado.tiempo_contador = ahora + PASO_CONTADOR_MS
+        elif ahora >= estado.tiempo_contador:
+            estado.contador_stack -= 1
+            estado.tiempo_contador = ahora + PASO_CONTADOR_MS
+            if estado.contador_stack <= 0:
+                siguiente = estado.stack.popleft()
+                estado.contador_stack = 0
+                estado.tiempo_contador = 0
+                if siguiente == "misterioso":
+                    self.empezar_revelacion(ahora)
+                else:
+                    self.aplicar(siguiente, ahora)
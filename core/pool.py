@@ -0,0 +1,51 @@
+# core/pool.py
+
+
+class Pool:
+    """
+    Reutiliza objetos en vez de crearlos y tirarlos cada frame.
+
+    adquirir(*args) devuelve un objeto libre reiniciado con obj.reset(*args), o uno
+    nuevo fabrica(*args) si no hay libres. liberar(obj) lo devuelve al pool (si el
+    pool ya tiene tamano_max libres, se descarta y lo recoge el GC).
+    """
+
+    def __init__(self, fabrica, tamano_max=64):
+        self.fabrica = fabrica
+        self.tamano_max = max(0, int(tamano_max))
+        self._libres = []
+        self.creados = 0
+        self.reutilizados = 0
+        self.liberados = 0
+        self.descartados = 0
+
+    def adquirir(self, *args, **kwargs):
+        if self._libres:
+            obj = self._libres.pop()
+            obj.reset(*args, **kwargs)
+            self.reutilizados += 1
+            return obj
+        self.creados += 1
+        return self.fabrica(*args, **kwargs)
+
+    def liberar(self, obj):
+        if len(self._libres) < self.tamano_max:
+            self._libres.append(obj)
+            self.liberados += 1
+        else:
+            self.descartados += 1
+
+    def precargar(self, n, *args, **kwargs):
+        """Crea n objetos libres por adelantado (por ejemplo al empezar la partida)."""
+        for _ in range(min(n, self.tamano_max - len(self._libres))):
+            self._libres.append(self.fabrica(*args, **kwargs))
+            self.creados += 1
+
+    def stats(self):
+        return {
+            "creados": self.creados,
+            "reutilizados": self.reutilizados,
+            "liberados": self.liberados,
+            "descartados": self.descartados,
+            "libres": len(self._libres),
+        }
@@ -0,0 +1,124 @@
+# core/replay.py
+"""
+Grabación y reproducción de partidas.
+
+Una grabación guarda la semilla de la partida, lo necesario para recrear al jugador
+y las entradas de cada tick (2 bits por tick: saltar/agachar). Como GameSimulation
+es determinista para una semilla y unas entradas dadas, reproducirla sin límite de
+FPS debe llegar exactamente al mismo estado final, que también va en el archivo.
+
+Uso: python -m core.replay replays/ultima_partida.rpl [--veces N]
+"""
+import os
+import struct
+import sys
+import time
+
+from core.simulacion import GameSimulation, bits_a_entrada
+
+MAGIC = b"SKRP"
+# 2: la caja misteriosa ya no ofrece 'reduccion' en el nivel 1 (las partidas v1 no se reproducen igual)
+VERSION = 2
+# magic, versión, semilla, alto jugador, nivel inicial, velocidad inicial, nº ticks
+_CABECERA = struct.Struct("<4sBIHHdI")
+# huella final: frame_count, nivel, velocidad, causa de muerte, y del jugador
+_HUELLA = struct.Struct("<IHdBi")
+_CAUSAS = (None, "techo", "suelo")
+
+REPLAY_DIR = "replays"
+
+
+def huella(sim):
+    """Resumen del estado final que debe coincidir al reproducir."""
+    return (sim.frame_count, sim.estado.nivel, sim.estado.velocidad,
+            sim.causa_muerte, sim.jugador.rect.y)
+
+
+def _empaquetar(registro):
+    out = bytearray((len(registro) + 3) // 4)
+    for i, bits in enumerate(registro):
+        out[i >> 2] |= (bits & 3) << ((i & 3) * 2)
+    return bytes(out)
+
+
+def _desempaquetar(datos, n):
+    return bytearray((datos[i >> 2] >> ((i & 3) * 2)) & 3 for i in range(n))
+
+
+class Grabacion:
+    def __init__(self, semilla, alto_jugador, nivel_inicial, velocidad_inicial, registro, huella_final):
+        self.semilla = semilla
+        self.alto_jugador = alto_jugador
+        self.nivel_inicial = nivel_inicial
+        self.velocidad_inicial = velocidad_inicial
+        self.registro = bytearray(registro)
+        self.huella_final = huella_final
+
+    @classmethod
+    def desde_simulacion(cls, sim):
+        return cls(sim.semilla, sim.jugador.tamano_original, sim.nivel_inicial, sim.velocidad_inicial,
+                   sim.registro, huella(sim))
+
+    def guardar(self, ruta):
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        frames, nivel, velocidad, causa, y = self.huella_final
+        with open(ruta, "wb") as f:
+            f.write(_CABECERA.pack(MAGIC, VERSION, self.semilla, self.alto_jugador, self.nivel_inicial,
+                                   self.velocidad_inicial, len(self.registro)))
+            f.write(_HUELLA.pack(frames, nivel, velocidad, _CAUSAS.index(causa), y))
+            f.write(_empaquetar(self.registro))
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta, "rb") as f:
+            datos = f.read()
+        magic, version, semilla, alto, nivel_ini, vel_ini, n = _CABECERA.unpack_from(datos, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{ruta}' no es una grabación válida")
+        if version != VERSION:
+            raise ValueError(f"'{ruta}' es de la versión {version} de las grabaciones (se reproduce la {VERSION})")
+        frames, nivel, velocidad, causa, y = _HUELLA.unpack_from(datos, _CABECERA.size)
+        registro = _desempaquetar(datos[_CABECERA.size + _HUELLA.size:], n)
+        return cls(semilla, alto, nivel_ini, vel_ini, registro, (frames, nivel, velocidad, _CAUSAS[causa], y))
+
+
+def reproducir(grabacion):
+    """
+    Vuelve a jugar la grabación sin límite de FPS.
+    Devuelve (sim, coincide) donde coincide indica si el estado final es el grabado.
+    """
+    sim = GameSimulation(semilla=grabacion.semilla, alto_jugador=grabacion.alto_jugador)
+    sim.estado.nivel = sim.nivel_inicial = grabacion.nivel_inicial
+    sim.estado.velocidad = sim.velocidad_inicial = grabacion.velocidad_inicial
+    for bits in grabacion.registro:
+        sim.step(bits_a_entrada(bits))
+    return sim, huella(sim) == grabacion.huella_final
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    veces = 1
+    if "--veces" in argv:
+        i = argv.index("--veces")
+        veces = max(1, int(argv[i + 1]))
+        del argv[i:i + 2]
+    grabacion = Grabacion.cargar(argv[0])
+    t0 = time.perf_counter()
+    for _ in range(veces):
+        sim, coincide = reproducir(grabacion)
+    dt = time.perf_counter() - t0
+    ticks = len(grabacion.registro) * veces
+    print(f"semilla={grabacion.semilla} ticks={len(grabacion.registro)} "
+          f"({ticks / dt:.0f} ticks/s, x{ticks / dt / 30:.0f} tiempo real)")
+    print(f"final: {huella(sim)}")
+    print("OK: coincide con la grabación" if coincide else f"DIFERENTE: se esperaba {grabacion.huella_final}")
+    return 0 if coincide else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
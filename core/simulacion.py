@@ -0,0 +1,266 @@
+# core/simulacion.py
+"""
+Lógica del juego sin ventana: física del jugador, spawns, colisiones, poderes y
+rampas de nivel/velocidad. No dibuja, no lee eventos y no limita los FPS, así que
+se puede avanzar tan rápido como se quiera (p. ej. con SDL_VIDEODRIVER=dummy).
+
+El tiempo de la simulación es propio: cada step avanza FRAME_MS milisegundos, y
+todo el azar sale de un random.Random sembrado por partida, así que la misma
+semilla con las mismas entradas reproduce la partida exacta (ver core/replay.py).
+"""
+import random
+from collections import namedtuple
+
+import pygame
+from settings import ANCHO
+from core.player import Player
+from core.obstaculo import POOL_OBSTACULOS
+from core.item import POOL_ITEMS
+from core.entidades import EntityStore
+from core.poderes import EstadoPoderes, MotorPoderes, MULTIPLICADOR_VELOCIDAD, tabla_misterioso
+
+FPS = 30
+FRAME_MS = 1000 / FPS
+
+# cada cuánto sube el nivel (ms de simulación); cuánto acelera está en core/poderes.py
+INTERVALO_NIVEL_MS = 12000
+
+# ticks mínimos entre spawns de obstáculos y entre ítems
+INTERVALO_SPAWN_TICKS = 35
+COOLDOWN_ITEMS_TICKS = 140
+
+# contenedores de obstáculos/ítems disponibles para GameSimulation
+BACKENDS = ("objetos", "numpy")
+
+# entrada de un tick: solo importan saltar y agacharse
+Entrada = namedtuple("Entrada", ["saltar", "agachar"])
+SIN_ENTRADA = Entrada(False, False)
+
+# bits de la entrada en el registro por frame
+BIT_SALTAR = 1
+BIT_AGACHAR = 2
+
+
+def entrada_a_bits(entrada):
+    return (BIT_SALTAR if entrada.saltar else 0) | (BIT_AGACHAR if entrada.agachar else 0)
+
+
+def bits_a_entrada(bits):
+    return Entrada(bool(bits & BIT_SALTAR), bool(bits & BIT_AGACHAR))
+
+
+def entrada_desde_teclas(keys):
+    """Convierte el resultado de pygame.key.get_pressed() en una Entrada."""
+    return Entrada(
+        bool(keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]),
+        bool(keys[pygame.K_DOWN] or keys[pygame.K_s]),
+    )
+
+
+def generar_obstaculos(obstaculos, tiempo, tiempo_ultimo_spawn, rng=random):
+    if tiempo - tiempo_ultimo_spawn < INTERVALO_SPAWN_TICKS:
+        return tiempo_ultimo_spawn
+
+    tipo = rng.choice(["techo", "suelo"])
+    if tipo == "techo":
+        num_bloque = rng.randint(1, 5)
+        x_offset = 0
+        for _ in range(num_bloque):
+            nuevo = POOL_OBSTACULOS.adquirir("techo", x_offset, rng)
+            obstaculos.append(nuevo)
+            x_offset += nuevo.ancho
+        tiempo_ultimo_spawn = tiempo + 25
+    else:
+        obstaculos.append(POOL_OBSTACULOS.adquirir("suelo", 0, rng))
+        tiempo_ultimo_spawn = tiempo
+
+    return tiempo_ultimo_spawn
+
+
+def generar_items(items, obstaculos, tiempo, tiempo_ultimo_item_spawn, nivel, jugador_rect, rng=random):
+    if tiempo - tiempo_ultimo_item_spawn < COOLDOWN_ITEMS_TICKS:
+        return tiempo_ultimo_item_spawn
+    base_prob = 0.02
+    prob = base_prob * (1.0 + 0.02 * max(0, nivel - 1))
+    if rng.random() >= prob:
+        return tiempo_ultimo_item_spawn
+    for _ in range(6):
+        nuevo = POOL_ITEMS.adquirir(rng)
+        # <-- evita que aparezca 'reduccion' si el nivel es 1
+        if nuevo.tipo == "reduccion" and nivel <= 1:
+            POOL_ITEMS.liberar(nuevo)
+            continue
+        nuevo.rect.y = jugador_rect.centery - nuevo.rect.height // 2
+        nuevo.rect.x = ANCHO + rng.randint(20, 260)
+        if not any(nuevo.rect.colliderect(o.rect) for o in obstaculos):
+            items.append(nuevo)
+            return tiempo
+        POOL_ITEMS.liberar(nuevo)
+    return tiempo_ultimo_item_spawn
+
+
+def elegir_efecto_misterioso(estado, rng=random):
+    """
+    Devuelve un efecto elegido para la caja misteriosa respetando los pesos.
+    No devuelve 'reduccion' si el nivel actual es 1.
+    """
+    return tabla_misterioso(estado.nivel).elegir(rng)
+
+
+class GameSimulation:
+    """
+    Una partida completa avanzada tick a tick con step(entrada).
+    sprite/escala se pasan a Player.set_sprite (None = jugador rectangular).
+    alto_jugador fija la altura del jugador sin cargar sprites (p. ej. al reproducir).
+    semilla: semilla del RNG de la partida (None = una al azar, guardada en self.semilla).
+    perfil: FrameProfiler opcional; step marca sus etapas en él.
+    backend: "objetos" (EntityStore de Obstaculo/Item) o "numpy" (core.mundo_np, requiere numpy).
+    """
+
+    def __init__(self, sprite=None, escala=1.8, semilla=None, alto_jugador=None, perfil=None,
+                 backend="objetos"):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend desconocido: {backend!r}")
+        self.backend = backend
+        self.sprite = sprite
+        self.escala = escala
+        self.alto_jugador = alto_jugador
+        self.perfil = perfil
+        self.rng = random.Random()
+        self.reiniciar(semilla=semilla)
+
+    def _crear_contenedores(self):
+        if self.backend == "numpy":
+            from core.mundo_np import TablaObstaculos, TablaItems
+            return TablaObstaculos(), TablaItems()
+        return (EntityStore(liberar=POOL_OBSTACULOS.liberar, colision="hitbox"),
+                EntityStore(liberar=POOL_ITEMS.liberar))
+
+    def _nuevo_jugador(self):
+        jugador = Player()
+        if self.sprite is not None:
+            jugador.set_sprite(self.sprite, self.escala)
+        elif self.alto_jugador:
+            jugador.tamano_original = self.alto_jugador
+            bottom = jugador.rect.bottom
+            jugador.rect.height = self.alto_jugador
+            jugador.rect.bottom = bottom
+        return jugador
+
+    def reiniciar(self, sprite=None, escala=None, conservar_estado=False, semilla=None):
+        """
+        Empieza una partida nueva. Con conservar_estado=True se mantiene el nivel y la
+        velocidad de la partida anterior, como al volver del tutorial con T.
+        """
+        self.semilla = semilla if semilla is not None else random.getrandbits(32)
+        self.rng.seed(self.semilla)
+        if sprite is not None:
+            self.sprite = sprite
+        if escala is not None:
+            self.escala = escala
+        anterior = getattr(self, "estado", None)
+        self.jugador = self._nuevo_jugador()
+        if conservar_estado and anterior is not None:
+            self.estado = EstadoPoderes(anterior.nivel, anterior.velocidad)
+        else:
+            self.estado = EstadoPoderes()
+        self.poderes = MotorPoderes(self.estado, self.rng)
+        # los que salen de los contenedores vuelven a su pool
+        if hasattr(self, "obstaculos"):
+            self.obstaculos.clear()
+            self.items.clear()
+        self.obstaculos, self.items = self._crear_contenedores()
+        self.tiempo = 0
+        self.tiempo_ultimo_spawn = 0
+        self.tiempo_ultimo_item_spawn = -9999
+        self.frame_count = 0
+        self.ahora = 0.0
+        self.ultimo_incremento = 0.0
+        self.game_over = False
+        self.causa_muerte = None
+        # entradas de cada tick (un byte por tick con BIT_SALTAR/BIT_AGACHAR)
+        self.registro = bytearray()
+        # nivel/velocidad con que empezó la partida (para poder reproducirla)
+        self.nivel_inicial = self.estado.nivel
+        self.velocidad_inicial = self.estado.velocidad
+
+    @property
+    def segundos_supervivencia(self):
+        return self.frame_count // FPS
+
+    def step(self, entrada=SIN_ENTRADA):
+        """Avanza un tick. Devuelve True si la partida terminó."""
+        if self.game_over:
+            return True
+        estado = self.estado
+        jugador = self.jugador
+        perfil = self.perfil
+
+        self.frame_count += 1
+        self.tiempo += 1
+        self.ahora += FRAME_MS
+        ahora = self.ahora
+        self.registro.append(entrada_a_bits(entrada))
+        jugador.aplicar_entrada(entrada.saltar, entrada.agachar)
+        jugador.mover()
+        if perfil:
+            perfil.marca("jugador")
+
+        # spawns
+        self.tiempo_ultimo_spawn = generar_obstaculos(self.obstaculos, self.tiempo, self.tiempo_ultimo_spawn, self.rng)
+        self.tiempo_ultimo_item_spawn = generar_items(self.items, self.obstaculos, self.tiempo,
+                                                      self.tiempo_ultimo_item_spawn, estado.nivel, jugador.rect,
+                                                      self.rng)
+
+        # rampa de nivel
+        if ahora - self.ultimo_incremento >= INTERVALO_NIVEL_MS:
+            estado.velocidad *= MULTIPLICADOR_VELOCIDAD
+            estado.nivel += 1
+            self.ultimo_incremento = ahora
+        if perfil:
+            perfil.marca("spawns")
+
+        self.poderes.actualizar(ahora)
+        if perfil:
+            perfil.marca("poderes")
+        self._actualizar_obstaculos()
+        if perfil:
+            perfil.marca("obstaculos")
+        self._actualizar_items(ahora)
+        if perfil:
+            perfil.marca("items")
+        self.poderes.actualizar_stack(ahora)
+        if perfil:
+            perfil.marca("poderes")
+        return self.game_over
+
+    def _actualizar_obstaculos(self):
+        estado = self.estado
+        jugador = self.jugador
+        obstaculos = self.obstaculos
+        obstaculos.mover(estado.velocidad)
+        obstaculos.retirar_fuera()
+
+        for obstaculo in obstaculos.colisiones(jugador.rect):
+            if self.poderes.absorber_golpe(self.ahora):
+                continue
+            if obstaculo.tipo == "techo" and not jugador.agachado:
+                self._morir("techo")
+            elif obstaculo.tipo == "suelo" and jugador.rect.bottom > obstaculo.rect.top:
+                self._morir("suelo")
+
+    def _morir(self, causa):
+        if not self.game_over:
+            self.causa_muerte = causa
+        self.game_over = True
+
+    def _actualizar_items(self, ahora):
+        estado = self.estado
+        jugador = self.jugador
+        items = self.items
+        items.mover(estado.velocidad)
+        items.retirar_fuera()
+
+        for item in items.colisiones(jugador.rect):
+            self.poderes.recoger(item.tipo, ahora)
+            items.quitar(item)
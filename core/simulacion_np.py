@@ -0,0 +1,483 @@
+# core/simulacion_np.py
+"""
+N partidas avanzadas a la vez (lockstep) con arrays de NumPy (opcional).
+
+SimulacionLote guarda el estado de cada partida en una fila de arrays: el jugador (y,
+alto, velocidad vertical, en_suelo, agachado), los temporizadores de los poderes
+(invulnerabilidad, revelación, cuenta de la pila), la rampa de nivel y los
+obstáculos/ítems en slots de tamaño fijo (N, capacidad), con un número de secuencia
+para conservar el orden de inserción. La física de Player.mover, mover y retirar
+obstáculos, las colisiones y los temporizadores son una operación vectorizada sobre
+todo el lote por tick.
+
+Lo que consume el RNG de la partida se sigue haciendo en Python, solo para las
+partidas a las que les toca ese tick y con las mismas funciones que GameSimulation:
+generar_obstaculos / generar_items (sobre adaptadores que escriben en los arrays),
+TablaPesos de la caja misteriosa y los Poder registrados (aplicar). Cada partida tiene
+su random.Random, así que la misma semilla con las mismas entradas da la misma
+partida que GameSimulation (lo comprueba `python -m bench verificar --lote`).
+
+    lote = SimulacionLote(range(1024))
+    terminadas = lote.step(saltar, agachar)   # arrays bool de N (o escalares)
+    lote.reiniciar(np.flatnonzero(terminadas), semillas_nuevas)
+
+Los efectos visuales (destellos, animación de la tragaperras, color de la
+invulnerabilidad) no se simulan.
+"""
+import random
+from collections import Counter, deque, namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional
+    np = None
+
+import pygame
+
+from settings import ALTO, ALTURA_SUELO
+from core import simulacion
+from core.player import Player, altura_agachado, IMPULSO_SALTO, GRAVEDAD, VELOCIDAD_MAX_CAIDA
+from core.obstaculo import POOL_OBSTACULOS
+from core.item import POOL_ITEMS
+from core.simulacion import (FPS, FRAME_MS, INTERVALO_SPAWN_TICKS, COOLDOWN_ITEMS_TICKS,
+                             generar_obstaculos, generar_items)
+from core.poderes import (PODERES, VELOCIDAD_INICIAL, CUENTA_STACK, PASO_CONTADOR_MS, DURACION_REVELACION_MS,
+                          DURACION_INVULNERABLE_ESCUDO_MS, tabla_misterioso)
+from core.mundo_np import TIPOS_OBSTACULO, TIPOS_ITEM
+
+CAUSAS = ("techo", "suelo")
+SUELO_Y = ALTO - ALTURA_SUELO
+# lo que la hitbox de un obstáculo se encoge por lado (Obstaculo.hitbox)
+INSET_OBSTACULO = 4
+
+_TECHO = TIPOS_OBSTACULO.index("techo")
+_SUELO = TIPOS_OBSTACULO.index("suelo")
+
+_ConRect = namedtuple("_ConRect", ["rect"])
+
+
+def disponible():
+    return np is not None
+
+
+# --- adaptadores: una partida del lote vista como los objetos que esperan las reglas ---
+
+class _Fila:
+    __slots__ = ("lote", "g")
+
+    def __init__(self, lote, g):
+        self.lote = lote
+        self.g = g
+
+
+class _ObstaculosFila(_Fila):
+    """Contenedor de obstáculos de la partida g para generar_obstaculos / generar_items."""
+    __slots__ = ()
+
+    def append(self, obstaculo):
+        self.lote._poner(self.lote.obstaculos, self.g, obstaculo, TIPOS_OBSTACULO)
+        POOL_OBSTACULOS.liberar(obstaculo)
+
+    def __iter__(self):
+        return (_ConRect(r) for r in self.lote.obstaculos.rects(self.g))
+
+
+class _ItemsFila(_Fila):
+    __slots__ = ()
+
+    def append(self, item):
+        self.lote._poner(self.lote.items, self.g, item, TIPOS_ITEM)
+        POOL_ITEMS.liberar(item)
+
+
+class _JugadorFila(_Fila):
+    """Lo único que generar_items lee del rect del jugador."""
+    __slots__ = ()
+
+    @property
+    def centery(self):
+        lote, g = self.lote, self.g
+        return int(lote.jugador_y[g]) + int(lote.jugador_h[g]) // 2
+
+
+def _campo(nombre, tipo):
+    def leer(self):
+        return tipo(getattr(self.lote, nombre)[self.g])
+
+    def escribir(self, valor):
+        getattr(self.lote, nombre)[self.g] = valor
+    return property(leer, escribir)
+
+
+class _EstadoFila(_Fila):
+    """Lo que los Poder leen y cambian de EstadoPoderes."""
+    __slots__ = ()
+    nivel = _campo("nivel", int)
+    velocidad = _campo("velocidad", float)
+    escudo = _campo("escudo", bool)
+
+    @property
+    def stack(self):
+        return self.lote.stacks[self.g]
+
+
+class _MotorFila(_Fila):
+    """Lo que Poder.aplicar usa de MotorPoderes (los destellos son solo visuales)."""
+    __slots__ = ("estado",)
+
+    def __init__(self, lote, g):
+        super().__init__(lote, g)
+        self.estado = _EstadoFila(lote, g)
+
+    def poner_invulnerable(self, ahora, duracion, color):
+        self.lote.invulnerable[self.g] = True
+        self.lote.tiempo_invulnerable[self.g] = ahora + duracion
+
+    def mostrar_destello(self, destello, ahora):
+        pass
+
+
+class Slots:
+    """Entidades de cada partida en arrays (N, capacidad); crecen al doble si una partida se llena."""
+
+    def __init__(self, n, capacidad):
+        self.n = n
+        self._reservar(capacidad)
+
+    def _reservar(self, capacidad):
+        viejo = getattr(self, "x", None)
+        for nombre, dtype in (("x", np.int64), ("y", np.int64), ("w", np.int64), ("h", np.int64),
+                              ("tipo", np.int8), ("vivo", np.bool_), ("seq", np.int64)):
+            arr = np.zeros((self.n, capacidad), dtype=dtype)
+            if viejo is not None:
+                arr[:, :self.capacidad] = getattr(self, nombre)
+            setattr(self, nombre, arr)
+        self.capacidad = capacidad
+
+    def libre(self, g):
+        libres = np.flatnonzero(~self.vivo[g])
+        if len(libres) == 0:
+            k = self.capacidad
+            self._reservar(self.capacidad * 2)
+            return k
+        return int(libres[0])
+
+    def orden(self, g, indices):
+        """indices de la partida g en el orden de EntityStore (x y, a igual x, inserción)."""
+        return sorted(indices, key=lambda k: (self.x[g, k], self.seq[g, k]))
+
+    def rects(self, g):
+        x, y, w, h = self.x[g], self.y[g], self.w[g], self.h[g]
+        return [pygame.Rect(int(x[k]), int(y[k]), int(w[k]), int(h[k])) for k in np.flatnonzero(self.vivo[g])]
+
+    def filas(self, g, tipos):
+        """[(x, y, w, h, tipo)] vivas de la partida g, en orden."""
+        vivas = self.orden(g, np.flatnonzero(self.vivo[g]).tolist())
+        return [(int(self.x[g, k]), int(self.y[g, k]), int(self.w[g, k]), int(self.h[g, k]),
+                 tipos[self.tipo[g, k]]) for k in vivas]
+
+
+class SimulacionLote:
+    """
+    semillas: una por partida (el lote tiene len(semillas) partidas).
+    alto_jugador: alto del jugador de pie (por defecto el de Player, 95 px).
+    capacidad_obstaculos / capacidad_items: slots iniciales por partida.
+    """
+
+    def __init__(self, semillas, alto_jugador=None, capacidad_obstaculos=16, capacidad_items=4):
+        if np is None:
+            raise RuntimeError("SimulacionLote requiere numpy (pip install numpy)")
+        semillas = list(semillas)
+        n = self.n = len(semillas)
+        jugador = Player()
+        self.jugador_x = jugador.rect.x
+        self.jugador_w = jugador.rect.width
+        self.alto_jugador = alto_jugador or jugador.tamano_original
+        self.alto_agachado = altura_agachado(self.alto_jugador)
+
+        self.semillas = [None] * n
+        self.rngs = [random.Random() for _ in range(n)]
+        self.frame_count = np.zeros(n, np.int64)
+        self.ahora = np.zeros(n, np.float64)
+        self.tiempo_ultimo_spawn = np.zeros(n, np.int64)
+        self.tiempo_ultimo_item_spawn = np.zeros(n, np.int64)
+        self.ultimo_incremento = np.zeros(n, np.float64)
+        self.game_over = np.zeros(n, np.bool_)
+        self.causa = np.zeros(n, np.int8)   # índice en CAUSAS; -1 = sigue viva
+
+        self.jugador_y = np.zeros(n, np.int64)
+        self.jugador_h = np.zeros(n, np.int64)
+        self.velocidad_y = np.zeros(n, np.float64)
+        self.en_suelo = np.zeros(n, np.bool_)
+        self.agachado = np.zeros(n, np.bool_)
+
+        self.nivel = np.zeros(n, np.int64)
+        self.velocidad = np.zeros(n, np.float64)
+        self.escudo = np.zeros(n, np.bool_)
+        self.invulnerable = np.zeros(n, np.bool_)
+        self.tiempo_invulnerable = np.zeros(n, np.float64)
+        self.revelando = np.zeros(n, np.bool_)
+        self.tiempo_revelacion = np.zeros(n, np.float64)
+        self.efecto_revelado = [None] * n
+        self.contador_stack = np.zeros(n, np.int64)
+        self.tiempo_contador = np.zeros(n, np.float64)
+        self.stacks = [deque() for _ in range(n)]
+        self.stack_len = np.zeros(n, np.int64)
+        self.aplicados = [Counter() for _ in range(n)]
+        self.recogidos = [Counter() for _ in range(n)]
+
+        self.obstaculos = Slots(n, capacidad_obstaculos)
+        self.items = Slots(n, capacidad_items)
+        self._seq = 0
+        self._ids = np.arange(n)
+        self._filas_obstaculos = [_ObstaculosFila(self, g) for g in range(n)]
+        self._filas_items = [_ItemsFila(self, g) for g in range(n)]
+        self._filas_jugador = [_JugadorFila(self, g) for g in range(n)]
+        self._motores = [_MotorFila(self, g) for g in range(n)]
+        self.reiniciar(self._ids, semillas)
+
+    def reiniciar(self, indices, semillas):
+        """Empieza partidas nuevas en las filas `indices` con `semillas` (una por fila)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        for g, semilla in zip(indices.tolist(), semillas):
+            self.semillas[g] = semilla
+            self.rngs[g].seed(semilla)
+            self.efecto_revelado[g] = None
+            self.stacks[g].clear()
+            self.aplicados[g].clear()
+            self.recogidos[g].clear()
+        for arr in (self.frame_count, self.ahora, self.tiempo_ultimo_spawn, self.ultimo_incremento,
+                    self.game_over, self.velocidad_y, self.agachado, self.escudo, self.invulnerable,
+                    self.tiempo_invulnerable, self.revelando, self.tiempo_revelacion, self.contador_stack,
+                    self.tiempo_contador, self.stack_len):
+            arr[indices] = 0
+        self.tiempo_ultimo_item_spawn[indices] = -9999
+        self.causa[indices] = -1
+        self.jugador_h[indices] = self.alto_jugador
+        self.jugador_y[indices] = SUELO_Y - self.alto_jugador
+        self.en_suelo[indices] = True
+        self.nivel[indices] = 1
+        self.velocidad[indices] = VELOCIDAD_INICIAL
+        self.obstaculos.vivo[indices] = False
+        self.items.vivo[indices] = False
+
+    # --- consultas ---
+
+    @property
+    def tiempo(self):
+        # GameSimulation lleva tiempo y frame_count por separado, pero avanzan juntos
+        return self.frame_count
+
+    @property
+    def segundos_supervivencia(self):
+        return self.frame_count // FPS
+
+    def causa_muerte(self, g):
+        c = int(self.causa[g])
+        return CAUSAS[c] if c >= 0 else None
+
+    # --- eventos por partida (en Python: consumen el RNG o tocan la pila) ---
+
+    def _poner(self, slots, g, entidad, tipos):
+        k = slots.libre(g)
+        r = entidad.rect
+        slots.x[g, k], slots.y[g, k], slots.w[g, k], slots.h[g, k] = r.x, r.y, r.width, r.height
+        slots.tipo[g, k] = tipos.index(entidad.tipo) if entidad.tipo in tipos else len(tipos) - 1
+        slots.vivo[g, k] = True
+        slots.seq[g, k] = self._seq
+        self._seq += 1
+
+    def _protegido(self, g):
+        return self.invulnerable[g] or self.escudo[g] or self.revelando[g]
+
+    def _aplicar(self, g, nombre, ahora):
+        self.aplicados[g][nombre] += 1
+        PODERES[nombre].aplicar(self._motores[g], ahora)
+        self.stack_len[g] = len(self.stacks[g])
+
+    def _empezar_revelacion(self, g, ahora):
+        self.revelando[g] = True
+        self.efecto_revelado[g] = tabla_misterioso(int(self.nivel[g])).elegir(self.rngs[g])
+        self.tiempo_revelacion[g] = ahora + DURACION_REVELACION_MS
+
+    def _recoger(self, g, tipo, ahora):
+        self.recogidos[g][tipo] += 1
+        if self._protegido(g):
+            self.stacks[g].append(tipo)
+            self.stack_len[g] += 1
+        elif tipo == "misterioso":
+            self._empezar_revelacion(g, ahora)
+        else:
+            self._aplicar(g, tipo, ahora)
+
+    # --- tick ---
+
+    def step(self, saltar=False, agachar=False):
+        """
+        Avanza un tick todas las partidas que siguen vivas (las terminadas no cambian).
+        saltar/agachar: bool o array de N bools. Devuelve game_over (array de N).
+        """
+        vivas = ~self.game_over
+        cuantas = int(np.count_nonzero(vivas))
+        if cuantas == 0:
+            return self.game_over
+        # con todas vivas, a es un slice y las lecturas son vistas (más barato)
+        a = slice(None) if cuantas == self.n else np.flatnonzero(vivas)
+        ids = self._ids[a]
+        saltar = np.broadcast_to(np.asarray(saltar, dtype=np.bool_), (self.n,))[a]
+        agachar = np.broadcast_to(np.asarray(agachar, dtype=np.bool_), (self.n,))[a]
+
+        self.frame_count[a] += 1
+        self.ahora[a] += FRAME_MS
+        tiempo = self.frame_count[a]
+        ahora = self.ahora[a]
+
+        y, h, en_suelo, agachado = self._mover_jugador(a, saltar, agachar)
+
+        # spawns: solo las partidas a las que les toca (consumen su RNG)
+        ult = self.tiempo_ultimo_spawn
+        for g in ids[tiempo - ult[a] >= INTERVALO_SPAWN_TICKS].tolist():
+            ult[g] = generar_obstaculos(self._filas_obstaculos[g], int(self.frame_count[g]), int(ult[g]),
+                                        self.rngs[g])
+        ult = self.tiempo_ultimo_item_spawn
+        for g in ids[tiempo - ult[a] >= COOLDOWN_ITEMS_TICKS].tolist():
+            ult[g] = generar_items(self._filas_items[g], self._filas_obstaculos[g], int(self.frame_count[g]),
+                                   int(ult[g]), int(self.nivel[g]), self._filas_jugador[g], self.rngs[g])
+
+        # rampa de nivel (las constantes se leen cada tick: core.lote puede cambiarlas)
+        sube = ahora - self.ultimo_incremento[a] >= simulacion.INTERVALO_NIVEL_MS
+        if sube.any():
+            s = ids[sube]
+            self.velocidad[s] *= simulacion.MULTIPLICADOR_VELOCIDAD
+            self.nivel[s] += 1
+            self.ultimo_incremento[s] = self.ahora[s]
+
+        # temporizadores, en el orden de MotorPoderes.actualizar: revelación y luego invulnerabilidad
+        for g in ids[self.revelando[a] & (ahora >= self.tiempo_revelacion[a])].tolist():
+            efecto = self.efecto_revelado[g]
+            self.revelando[g] = False
+            self.efecto_revelado[g] = None
+            self._aplicar(g, efecto, float(self.ahora[g]))
+        self.invulnerable[a] &= ~(ahora > self.tiempo_invulnerable[a])
+
+        velocidad = self.velocidad[a].astype(np.int64)[:, None]
+        self._obstaculos(a, ids, velocidad, y, h, agachado)
+        self._items(a, ids, velocidad, y, h)
+        self._actualizar_stack(a, ids)
+        return self.game_over
+
+    def _mover_jugador(self, a, saltar, agachar):
+        """Player.aplicar_entrada + Player.mover vectorizados; devuelve (y, h, en_suelo, agachado)."""
+        y = self.jugador_y[a]
+        h = self.jugador_h[a]
+        vy = self.velocidad_y[a]
+        en_suelo = self.en_suelo[a]
+        agachado = self.agachado[a]
+
+        salta = saltar & en_suelo & ~agachado
+        vy = np.where(salta, float(IMPULSO_SALTO), vy)
+        en_suelo = en_suelo & ~salta
+        agacha = agachar & en_suelo
+        bottom = y + h
+        h = np.where(agacha, self.alto_agachado, np.where(agachado, self.alto_jugador, h))
+        y = bottom - h
+        agachado = agacha
+
+        # int() de Python trunca hacia cero, igual que astype
+        y = y + vy.astype(np.int64)
+        vy = np.where(en_suelo, vy, np.minimum(vy + GRAVEDAD, float(VELOCIDAD_MAX_CAIDA)))
+        toca = y + h >= SUELO_Y
+        y = np.where(toca, SUELO_Y - h, y)
+        en_suelo = en_suelo | toca
+        vy = np.where(toca, 0.0, vy)
+
+        self.jugador_y[a] = y
+        self.jugador_h[a] = h
+        self.velocidad_y[a] = vy
+        self.en_suelo[a] = en_suelo
+        self.agachado[a] = agachado
+        return y, h, en_suelo, agachado
+
+    def _toca_jugador(self, x, oy, w, oh, y, h):
+        """Rect.colliderect del jugador contra cada slot (cajas de ancho/alto <= 0 no tocan)."""
+        px, pw = self.jugador_x, self.jugador_w
+        return ((w > 0) & (oh > 0) & (px < x + w) & (px + pw > x)
+                & (y[:, None] < oy + oh) & (y[:, None] + h[:, None] > oy))
+
+    def _obstaculos(self, a, ids, velocidad, y, h, agachado):
+        o = self.obstaculos
+        x = o.x[a] - velocidad
+        vivo = o.vivo[a] & (x + o.w[a] >= 0)
+        o.x[a] = x
+        o.vivo[a] = vivo
+        oy, w, oh = o.y[a], o.w[a], o.h[a]
+        k = INSET_OBSTACULO
+        toca = vivo & self._toca_jugador(x + k, oy + k, w - 2 * k, oh - 2 * k, y, h)
+        golpe = toca.any(axis=1)
+        if not golpe.any():
+            return
+        # el primer golpe lo absorbe la invulnerabilidad o, si no, el escudo (que da 2 s de invulnerabilidad
+        # y absorbe también el resto de choques del tick)
+        invulnerable = self.invulnerable[a]
+        escudo = self.escudo[a]
+        usa_escudo = golpe & ~invulnerable & escudo
+        if usa_escudo.any():
+            g = ids[usa_escudo]
+            self.escudo[g] = False
+            self.invulnerable[g] = True
+            self.tiempo_invulnerable[g] = self.ahora[g] + DURACION_INVULNERABLE_ESCUDO_MS
+        expuesto = golpe & ~invulnerable & ~escudo
+        if not expuesto.any():
+            return
+        tipo = o.tipo[a]
+        mortal = toca & expuesto[:, None] & (
+            ((tipo == _TECHO) & ~agachado[:, None]) | ((tipo == _SUELO) & ((y + h)[:, None] > oy)))
+        muere = mortal.any(axis=1)
+        if not muere.any():
+            return
+        # la causa es la del primer obstáculo mortal en el orden de colisiones (x, inserción)
+        filas = np.flatnonzero(muere)
+        clave = np.where(mortal[filas], x[filas] * (1 << 32) + o.seq[a][filas], np.iinfo(np.int64).max)
+        primero = tipo[filas, np.argmin(clave, axis=1)]
+        g = ids[filas]
+        self.game_over[g] = True
+        self.causa[g] = np.where(primero == _TECHO, CAUSAS.index("techo"), CAUSAS.index("suelo"))
+
+    def _items(self, a, ids, velocidad, y, h):
+        it = self.items
+        x = it.x[a] - velocidad
+        vivo = it.vivo[a] & (x + it.w[a] >= 0)
+        it.x[a] = x
+        it.vivo[a] = vivo
+        toca = vivo & self._toca_jugador(x, it.y[a], it.w[a], it.h[a], y, h)
+        filas = np.flatnonzero(toca.any(axis=1))
+        for fila in filas.tolist():
+            g = int(ids[fila])
+            ahora = float(self.ahora[g])
+            for k in it.orden(g, np.flatnonzero(toca[fila]).tolist()):
+                self._recoger(g, TIPOS_ITEM[it.tipo[g, k]], ahora)
+                it.vivo[g, k] = False
+
+    def _actualizar_stack(self, a, ids):
+        """MotorPoderes.actualizar_stack vectorizado; lo que sale de la pila se aplica en Python."""
+        cuenta = (self.stack_len[a] > 0) & ~(self.invulnerable[a] | self.escudo[a] | self.revelando[a])
+        if not cuenta.any():
+            return
+        g = ids[cuenta]
+        ahora = self.ahora[g]
+        contador = self.contador_stack[g]
+        empieza = contador == 0
+        paso = ~empieza & (ahora >= self.tiempo_contador[g])
+        contador = np.where(empieza, CUENTA_STACK, contador - paso)
+        self.contador_stack[g] = contador
+        self.tiempo_contador[g] = np.where(empieza | paso, ahora + PASO_CONTADOR_MS, self.tiempo_contador[g])
+        for j in np.flatnonzero(paso & (contador <= 0)).tolist():
+            gj = int(g[j])
+            siguiente = self.stacks[gj].popleft()
+            self.stack_len[gj] -= 1
+            self.contador_stack[gj] = 0
+            self.tiempo_contador[gj] = 0
+            if siguiente == "misterioso":
+                self._empezar_revelacion(gj, float(self.ahora[gj]))
+            else:
+                self._aplicar(gj, siguiente, float(self.ahora[gj]))
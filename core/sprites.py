@@ -1,5 +1,54 @@
+from collections import namedtuple
+
 import pygame
 
+# datos precalculados de cada frame (se calculan una sola vez al cortar el sheet):
+#   baseline: última fila con algún píxel no transparente (los "pies")
+#   bbox: rect ajustado a los píxeles visibles
+#   opacos: cantidad de píxeles no transparentes
+FrameMeta = namedtuple("FrameMeta", ["baseline", "bbox", "opacos"])
+
+
+def calcular_meta(frame: pygame.Surface) -> FrameMeta:
+    """Calcula FrameMeta con una máscara (alpha != 0), sin recorrer píxeles en Python."""
+    w, h = frame.get_size()
+    mask = pygame.mask.from_surface(frame, 0)
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return FrameMeta(h - 1, pygame.Rect(0, 0, 0, 0), 0)
+    bbox = rects[0].unionall(rects[1:])
+    return FrameMeta(bbox.bottom - 1, bbox, mask.count())
+
+
+def cortar_sheet(sheet: pygame.Surface, frame_w: int = None) -> list:
+    """
+    Corta un sheet horizontal en frames SRCALPHA de frame_w x alto (por defecto cuadrados).
+    No depende de la ventana, así que se puede llamar desde un hilo de carga.
+    """
+    h = sheet.get_height()
+    frame_w = frame_w or h
+    if frame_w <= 0:
+        raise ValueError("frame_w inválido")
+    cols = max(1, sheet.get_width() // frame_w)
+    frames = []
+    for i in range(cols):
+        rect = pygame.Rect(i * frame_w, 0, frame_w, h)
+        frame = pygame.Surface((frame_w, h), pygame.SRCALPHA)
+        frame.blit(sheet, (0, 0), rect)
+        frames.append(frame)
+    if not frames:
+        # fallback: usar la sheet entera
+        frames = [sheet.copy()]
+    return frames
+
+
+def escalar_frame(frame: pygame.Surface, alto: int) -> pygame.Surface:
+    """Frame escalado (manteniendo proporción) a `alto` píxeles, como lo dibuja Player."""
+    fw, fh = frame.get_width(), frame.get_height()
+    scale = alto / fh if fh > 0 else 1.0
+    return pygame.transform.smoothscale(frame, (max(1, int(fw * scale)), max(1, int(fh * scale))))
+
+
 class AnimatedSprite:
     """
     Crea una animación a partir de un sprite sheet horizontal.
@@ -12,25 +61,29 @@ class AnimatedSprite:
         self.last_update = pygame.time.get_ticks()
         self.frame_time = 1000 // max(1, fps)
 
-        # determinar tamaño del frame
-        h = self.sheet.get_height()
-        self.frame_w = frame_w or h
-        total_w = self.sheet.get_width()
-        self.frames = []
-        if self.frame_w <= 0:
-            raise ValueError("frame_w inválido")
-        cols = max(1, total_w // self.frame_w)
-        for i in range(cols):
-            rect = pygame.Rect(i * self.frame_w, 0, self.frame_w, h)
-            frame = pygame.Surface((self.frame_w, h), pygame.SRCALPHA)
-            frame.blit(self.sheet, (0, 0), rect)
-            self.frames.append(frame)
-        if not self.frames:
-            # fallback: usar la sheet entera
-            self.frames = [self.sheet.copy()]
+        self.frame_w = frame_w or self.sheet.get_height()
+        self.frames = cortar_sheet(self.sheet, self.frame_w)
+        self.meta = [calcular_meta(f) for f in self.frames]
+        # alto -> frames ya escalados a ese alto (los usa Player en vez de smoothscale)
+        self.escalados = {}
 
         self.index = 0
 
+    @classmethod
+    def desde_frames(cls, frames, fps: int = 8, meta=None, escalados=None):
+        """Animación con frames ya cortados (y su FrameMeta y versiones escaladas si ya se tienen)."""
+        ret = cls.__new__(cls)
+        ret.sheet = None
+        ret.fps = fps
+        ret.last_update = pygame.time.get_ticks()
+        ret.frame_time = 1000 // max(1, fps)
+        ret.frame_w = frames[0].get_width()
+        ret.frames = list(frames)
+        ret.meta = list(meta) if meta is not None else [calcular_meta(f) for f in ret.frames]
+        ret.escalados = dict(escalados) if escalados else {}
+        ret.index = 0
+        return ret
+
     def update(self):
         now = pygame.time.get_ticks()
         if now - self.last_update >= self.frame_time:
@@ -40,6 +93,9 @@ class AnimatedSprite:
     def get_frame(self) -> pygame.Surface:
         return self.frames[self.index]
 
+    def get_meta(self) -> FrameMeta:
+        return self.meta[self.index]
+
     def reset(self):
         self.index = 0
         self.last_update = pygame.time.get_ticks()
@@ -63,5 +119,8 @@ class AnimatedSprite:
         ret.frame_time = self.frame_time
         ret.frame_w = self.frame_w
         ret.frames = out_frames
+        # el ADD con alpha vuelve opacos los píxeles transparentes: baseline/bbox cambian
+        ret.meta = [calcular_meta(f) for f in out_frames]
+        ret.escalados = {}
         ret.index = 0
         return ret
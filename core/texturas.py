@@ -0,0 +1,87 @@
+# core/texturas.py
+import os
+from collections import OrderedDict
+
+import pygame
+
+# los tamaños pedidos se redondean hacia arriba a múltiplos de esto (más aciertos en la cache)
+TEXTURE_BUCKET = 8
+# máximo de variantes escaladas por textura
+TEXTURE_CACHE_MAX = 64
+
+
+class TextureStore:
+    """
+    Carga una imagen una sola vez (la primera ruta que exista) y guarda versiones
+    escaladas por (ancho, alto) con expulsión LRU.
+
+    Los tamaños se ajustan a cubetas de TEXTURE_BUCKET px redondeando hacia arriba,
+    así que la superficie devuelta puede ser un poco más grande que lo pedido:
+    quien la dibuja debe recortarla con el área del rect.
+    """
+
+    def __init__(self, paths, bucket=TEXTURE_BUCKET, max_entries=TEXTURE_CACHE_MAX):
+        self.paths = list(paths)
+        self.bucket = max(1, int(bucket))
+        self.max_entries = max(1, int(max_entries))
+        self._source = None
+        self._source_failed = False
+        self._scaled = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def _cargar_source(self):
+        if self._source is not None or self._source_failed:
+            return self._source
+        for p in self.paths:
+            try:
+                if os.path.isfile(p):
+                    surf = pygame.image.load(p)
+                    if pygame.display.get_surface() is not None:
+                        surf = surf.convert_alpha()
+                    if surf.get_width() > 0 and surf.get_height() > 0:
+                        self._source = surf
+                        return surf
+            except Exception as e:
+                print(f"[WARN] fallo cargando textura '{p}': {e}")
+        # no reintentamos en cada llamada: sin imagen se usa el rect de color
+        self._source_failed = True
+        return None
+
+    def _snap(self, v):
+        b = self.bucket
+        return max(b, -(-int(v) // b) * b)
+
+    def get(self, ancho, alto):
+        """Devuelve la textura escalada a (ancho, alto) redondeado a la cubeta, o None."""
+        key = (self._snap(ancho), self._snap(alto))
+        surf = self._scaled.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._scaled.move_to_end(key)
+            return surf
+        self.misses += 1
+        source = self._cargar_source()
+        if source is None:
+            return None
+        surf = pygame.transform.smoothscale(source, key)
+        self._scaled[key] = surf
+        self.bytes += surf.get_bytesize() * key[0] * key[1]
+        while len(self._scaled) > self.max_entries:
+            _, viejo = self._scaled.popitem(last=False)
+            self.bytes -= viejo.get_bytesize() * viejo.get_width() * viejo.get_height()
+        return surf
+
+    def clear(self):
+        self._scaled.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._scaled),
+            "bytes": self.bytes,
+            "source_loaded": self._source is not None,
+        }
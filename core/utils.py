@@ -1,6 +1,61 @@
 import pygame
+from collections import OrderedDict
+
+# máximo de textos renderizados guardados (se descartan los menos usados)
+TEXT_CACHE_MAX = 256
+
+# (nombre, tamaño) -> Font; SysFont es caro, cada fuente se construye una sola vez
+_FUENTES = {}
+
+
+def obtener_fuente(nombre, tam):
+    """Devuelve pygame.font.SysFont(nombre, tam) reutilizando la misma instancia."""
+    key = (nombre, tam)
+    fuente = _FUENTES.get(key)
+    if fuente is None:
+        fuente = pygame.font.SysFont(nombre, tam)
+        _FUENTES[key] = fuente
+    return fuente
+
+
+class TextCache:
+    """Superficies de texto ya renderizadas por (texto, fuente, color, antialias), con expulsión LRU."""
+
+    def __init__(self, max_entries=TEXT_CACHE_MAX):
+        self.max_entries = max(1, int(max_entries))
+        self._surfs = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, fuente, texto, color, antialias=True):
+        key = (texto, fuente, tuple(color), antialias)
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfs.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = fuente.render(texto, antialias, color)
+        self._surfs[key] = surf
+        if len(self._surfs) > self.max_entries:
+            self._surfs.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfs.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._surfs)}
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_texto(fuente, texto, color, antialias=True):
+    return TEXT_CACHE.render(fuente, str(texto), color, antialias)
+
 
 def dibujar_texto(ventana, texto, fuente, color, pos):
     x, y = pos
-    surf = fuente.render(str(texto), True, color)
+    surf = render_texto(fuente, texto, color)
     ventana.blit(surf, (x, y))
@@ -11,3 +11,17 @@ COLOR_JUGADOR = (95, 95, 220)
 
 # Altura del "suelo" (desde la parte inferior)
 ALTURA_SUELO = 70
+
+# FPS de dibujado. La lógica siempre avanza a 30 ticks por segundo (paso fijo);
+# con más FPS solo se interpolan las posiciones entre ticks (p. ej. 60 o 144).
+FPS_RENDER = 30
+# máximo de ticks de lógica por frame dibujado (si un frame tarda mucho no intentamos
+# recuperar todo de golpe)
+MAX_TICKS_POR_FRAME = 5
+# gobernador de calidad (core/calidad.py): si los frames no entran en el presupuesto se
+# reduce la resolución del fondo y se quitan efectos opcionales; F5 lo activa/desactiva
+CALIDAD_ADAPTATIVA = True
+
+# objetos libres que se guardan para reutilizar (obstáculos / ítems)
+POOL_OBSTACULOS_MAX = 64
+POOL_ITEMS_MAX = 32